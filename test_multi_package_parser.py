@@ -209,8 +209,154 @@ def test_single_vs_multi():
         return False
 
 
+def test_repeated_calls_parse_once():
+    """Test that asking for several packages from one file parses it only once"""
+    from utils import package_decomposer_multi as multi
+
+    multi._PARSE_CACHE.clear()
+    emp = decompose_oracle_package('PKG_EMPLOYEE', MULTIPLE_PACKAGES)
+    dept = decompose_oracle_package('PKG_DEPARTMENT', MULTIPLE_PACKAGES)
+    all_results = decompose_all_packages(MULTIPLE_PACKAGES)
+
+    assert len(multi._PARSE_CACHE) == 1
+    assert all_results['PKG_EMPLOYEE'] == emp
+    assert all_results['PKG_DEPARTMENT'] == dept
+
+
+def test_cached_results_not_shared():
+    """Test that editing a returned member does not leak into later calls"""
+    first = decompose_oracle_package('PKG_EMPLOYEE', MULTIPLE_PACKAGES)
+    original_body = first['members'][0].body
+    first['members'][0].body = "-- edited by caller"
+    first['members'].clear()
+
+    again = decompose_oracle_package('PKG_EMPLOYEE', MULTIPLE_PACKAGES)
+    all_results = decompose_all_packages(MULTIPLE_PACKAGES)
+
+    assert again['members'][0].body == original_body
+    assert all_results['PKG_EMPLOYEE']['members'][0].body == original_body
+
+
+def test_large_package_not_truncated():
+    """Test that a package body longer than 50k chars is discovered whole"""
+    filler = "        v_x := v_x + 1;\n" * 3000
+    big_pkg = (
+        "CREATE OR REPLACE PACKAGE BODY pkg_big IS\n"
+        "    PROCEDURE first_proc IS\n"
+        "        v_x NUMBER := 0;\n"
+        "    BEGIN\n" + filler +
+        "    END first_proc;\n"
+        "    PROCEDURE last_proc IS BEGIN NULL; END last_proc;\n"
+        "END pkg_big;\n/\n"
+        "CREATE OR REPLACE PACKAGE pkg_next IS\n"
+        "    PROCEDURE next_proc;\n"
+        "END pkg_next;\n/\n"
+    )
+
+    all_results = decompose_all_packages(big_pkg)
+
+    names = [m.name for m in all_results['PKG_BIG']['members']]
+    assert names == ['first_proc', 'last_proc']
+    assert [m.name for m in all_results['PKG_NEXT']['members']] == ['next_proc']
+
+
+def test_keywords_in_comments_and_strings_ignored():
+    """Test that PROCEDURE/FUNCTION inside comments or strings are not members"""
+    pkg = """
+    CREATE OR REPLACE PACKAGE BODY pkg_notes IS
+        -- PROCEDURE implementation notes live here
+        /* FUNCTION helper RETURN NUMBER; is planned */
+        PROCEDURE log_it IS
+        BEGIN
+            DBMS_OUTPUT.PUT_LINE('PROCEDURE log_it called');
+        END log_it;
+    END pkg_notes;
+    /
+    """
+
+    result = decompose_all_packages(pkg)['PKG_NOTES']
+
+    assert [m.name for m in result['members']] == ['log_it']
+
+
+def _member_names(result):
+    return [m.name for m in result['members']]
+
+
+def test_header_in_line_comment_ignored():
+    """Test that CREATE PACKAGE in a -- comment does not split the package"""
+    pkg = """
+    CREATE OR REPLACE PACKAGE BODY pkg_a IS
+        -- Split out of: CREATE OR REPLACE PACKAGE legacy_pkg
+        PROCEDURE p1 IS
+        BEGIN
+            NULL;
+        END p1;
+    END pkg_a;
+    /
+    """
+
+    all_results = decompose_all_packages(pkg)
+
+    assert list(all_results) == ['PKG_A']
+    assert _member_names(all_results['PKG_A']) == ['p1']
+
+
+def test_header_in_block_comment_ignored():
+    """Test that CREATE PACKAGE in a /* */ comment does not split the package"""
+    pkg = """
+    CREATE OR REPLACE PACKAGE BODY pkg_b IS
+        /* Replaces:
+           CREATE OR REPLACE PACKAGE BODY old_pkg IS ... */
+        PROCEDURE p1 IS
+        BEGIN
+            NULL;
+        END p1;
+    END pkg_b;
+    /
+    """
+
+    all_results = decompose_all_packages(pkg)
+
+    assert list(all_results) == ['PKG_B']
+    assert _member_names(all_results['PKG_B']) == ['p1']
+
+
+def test_header_in_string_ignored():
+    """Test that CREATE PACKAGE inside a string literal keeps member bodies"""
+    pkg = """
+    CREATE OR REPLACE PACKAGE BODY pkg_ddl IS
+        PROCEDURE make_pkg IS
+        BEGIN
+            EXECUTE IMMEDIATE 'CREATE OR REPLACE PACKAGE tmp_pkg AS x NUMBER; END tmp_pkg;';
+        END make_pkg;
+
+        PROCEDURE after_it IS
+        BEGIN
+            NULL;
+        END after_it;
+    END pkg_ddl;
+    /
+    """
+
+    all_results = decompose_all_packages(pkg)
+
+    assert list(all_results) == ['PKG_DDL']
+    members = all_results['PKG_DDL']['members']
+    assert [(m.name, bool(m.body)) for m in members] == [
+        ('make_pkg', True), ('after_it', True)
+    ]
+
+
 if __name__ == "__main__":
     test1 = test_multi_package()
     test2 = test_single_vs_multi()
+    test_repeated_calls_parse_once()
+    test_cached_results_not_shared()
+    test_large_package_not_truncated()
+    test_keywords_in_comments_and_strings_ignored()
+    test_header_in_line_comment_ignored()
+    test_header_in_block_comment_ignored()
+    test_header_in_string_ignored()
 
     sys.exit(0 if (test1 and test2) else 1)
@@ -414,6 +414,45 @@ def test_migration_report():
     print("\n✅ Test 10 PASSED - Migration report generated successfully")
 
 
+def test_batch_analysis():
+    """Test batch analysis matches analyzing objects one by one"""
+    print("\n" + "=" * 70)
+    print("TEST 11: Batch Code Object Analysis")
+    print("=" * 70)
+
+    entries = [
+        ("procedure", "proc1", "dbo", "SELECT SEQ1.NEXTVAL INTO v FROM DUAL;"),
+        ("function", "func1", None, "RETURN hr.SEQ2.CURRVAL + SEQ1.NEXTVAL;"),
+        ("view", "v1", "dbo", "SELECT 1 FROM DUAL"),
+        ("package", "pkg1", "hr", "v := SEQ2.NEXTVAL; w := SEQ2.NEXTVAL;"),
+    ]
+
+    single = SequenceAnalyzer(default_schema="dbo")
+    for object_type, name, schema, code in entries:
+        getattr(single, f"analyze_{object_type}")(name, code, schema)
+
+    batch = SequenceAnalyzer(default_schema="dbo")
+    batch.analyze_code_batch(entries)
+
+    single_plan = single.generate_migration_plan()
+    batch_plan = batch.generate_migration_plan()
+
+    print(f"\nSequences: {sorted(batch_plan)}")
+
+    assert sorted(batch_plan) == sorted(single_plan), "Should find the same sequences"
+    for seq_name, plan in single_plan.items():
+        assert batch_plan[seq_name]["usage_summary"] == plan["usage_summary"], \
+            f"Usage differs for {seq_name}"
+        assert {k: sorted(v) for k, v in batch_plan[seq_name]["used_in"].items()} == \
+            {k: sorted(v) for k, v in plan["used_in"].items()}, \
+            f"Used-in differs for {seq_name}"
+
+    assert batch_plan["hr.SEQ2"]["usage_summary"]["nextval_count"] == 2, \
+        "hr.SEQ2 should have 2 NEXTVAL usages"
+
+    print("\n✅ Test 11 PASSED - Batch analysis matches per-object analysis")
+
+
 def run_all_tests():
     """Run all sequence migration tests"""
     print("\n" + "=" * 80)
@@ -431,6 +470,7 @@ def run_all_tests():
         test_trigger_analysis()
         test_cross_schema_sequences()
         test_migration_report()
+        test_batch_analysis()
 
         print("\n" + "=" * 80)
         print("✅ ALL TESTS PASSED")
@@ -41,3 +41,45 @@ if result['total_procedures'] >= 1 and result['total_functions'] >= 1:
     print("\n[PASS] Universal parser works!")
 else:
     print("\n[FAIL] Parser didn't find all members")
+
+# Nested parentheses in parameter types
+NESTED_PARAMS_PKG = """
+CREATE OR REPLACE PACKAGE BODY pkg_params IS
+    PROCEDURE save_amount(p_amount IN NUMBER(10,2), p_note IN VARCHAR2(100)) IS
+    BEGIN
+        NULL;
+    END save_amount;
+END pkg_params;
+/
+"""
+
+result = decompose_oracle_package('pkg_params', NESTED_PARAMS_PKG)
+params = result['members'][0].parameters if result['members'] else []
+print("\nParameters:", params)
+
+if params == ['p_amount IN NUMBER(10,2)', 'p_note IN VARCHAR2(100)']:
+    print("[PASS] Nested parameter types parsed")
+else:
+    print("[FAIL] Nested parameter types not parsed")
+
+# PROCEDURE/FUNCTION inside comments and strings are not members
+COMMENTED_PKG = """
+CREATE OR REPLACE PACKAGE BODY pkg_notes IS
+    -- Private procedure helpers
+    /* FUNCTION old_calc was removed */
+    PROCEDURE log_note(p_msg IN VARCHAR2) IS
+    BEGIN
+        DBMS_OUTPUT.PUT_LINE('PROCEDURE log_note called');
+    END log_note;
+END pkg_notes;
+/
+"""
+
+result = decompose_oracle_package('pkg_notes', COMMENTED_PKG)
+names = [m.name for m in result['members']]
+print("\nMembers:", names)
+
+if names == ['log_note']:
+    print("[PASS] Comments and strings ignored")
+else:
+    print("[FAIL] Members found in comments or strings")
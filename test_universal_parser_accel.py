@@ -0,0 +1,113 @@
+"""
+Test the optional universal parser accelerators
+
+The numba block scanner and the hyperscan keyword scanner must agree with
+the regex scanners they stand in for. Each test is skipped when its
+backend is not installed.
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils.package_decomposer_universal import UniversalPackageParser, _FAST_SCAN_MIN_LEN
+
+
+# Fragments that exercise block nesting, keyword boundaries and quoting
+TOKENS = [
+    'BEGIN', 'begin', 'END', 'end', 'LOOP', 'CASE', 'case', 'IF', 'Begin',
+    'ENDX', 'XEND', 'BEGIN1', 'END_DATE', 'v_end', 'x', '_', '1',
+    ' ', '\n', ';', '(', ')', "'", '"', '\\',
+]
+
+MEMBER_BODIES = [
+    "BEGIN\n        NULL;\n    END {name};",
+    "BEGIN\n        FOR r IN (SELECT 1 FROM dual) LOOP\n            v_end := 1;\n"
+    "        END LOOP;\n    END {name};",
+    "BEGIN\n        v_x := CASE WHEN p_id > 0 THEN 'END' ELSE 'begin' END;\n"
+    "    END {name};",
+    "BEGIN\n        -- END of the world\n        IF p_id IS NULL THEN\n"
+    "            RETURN;\n        END IF;\n    END {name};",
+    "BEGIN\n        log_it('it''s the END');\n        BEGIN\n            NULL;\n"
+    "        EXCEPTION WHEN OTHERS THEN NULL;\n        END;\n    END {name};",
+]
+
+
+def _token_soup(rng):
+    return ''.join(rng.choice(TOKENS) for _ in range(rng.randint(0, 25)))
+
+
+def _random_package(rng):
+    """Package body with enough members to pass the compiled-scan threshold"""
+    parts = ["CREATE OR REPLACE PACKAGE BODY pkg_fuzz IS\n"]
+    size = 0
+    index = 0
+    while size <= _FAST_SCAN_MIN_LEN:
+        name = f"member_{index}"
+        body = rng.choice(MEMBER_BODIES).format(name=name)
+        if rng.random() < 0.5:
+            member = f"    PROCEDURE {name}(p_id IN NUMBER) IS\n    {body}\n\n"
+        else:
+            member = f"    FUNCTION {name}(p_id IN NUMBER) RETURN NUMBER IS\n    {body}\n\n"
+        parts.append(member)
+        size += len(member)
+        index += 1
+    parts.append("END pkg_fuzz;\n/\n")
+    return ''.join(parts)
+
+
+def _regex_parser():
+    parser = UniversalPackageParser()
+    parser._fast_find_end = None
+    parser._scan_tokens = None
+    return parser
+
+
+def test_numba_scanner_matches_regex():
+    """Test that the compiled block scanner finds the same END as the regex scanner"""
+    pytest.importorskip("numba")
+    pytest.importorskip("numpy")
+
+    fast = UniversalPackageParser()
+    assert fast._fast_find_end is not None
+    fast._scan_tokens = None
+    reference = _regex_parser()
+
+    rng = random.Random(0)
+    for _ in range(2000):
+        code = _token_soup(rng)
+        for start in range(0, len(code) + 1, max(1, len(code) // 4)):
+            expected = reference._find_matching_end(code, start)
+            assert fast._fast_find_end(code.upper(), start) == expected, (code, start)
+
+    for _ in range(20):
+        code = _random_package(rng)
+        assert fast.parse(code) == reference.parse(code)
+
+
+def test_hyperscan_scanner_matches_regex():
+    """Test that parse() output is the same with the hyperscan scanner on and off"""
+    pytest.importorskip("hyperscan")
+
+    fast = UniversalPackageParser()
+    assert fast._scan_tokens is not None
+    fast._fast_find_end = None
+    reference = _regex_parser()
+
+    rng = random.Random(0)
+    for _ in range(2000):
+        code = _token_soup(rng)
+        for start in range(0, len(code) + 1, max(1, len(code) // 4)):
+            expected = reference._find_matching_end(code, start)
+            assert fast._find_matching_end(code, start) == expected, (code, start)
+
+    for _ in range(20):
+        code = _random_package(rng)
+        assert fast.parse(code) == reference.parse(code)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
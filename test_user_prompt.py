@@ -0,0 +1,55 @@
+"""
+Test User Prompt Timeouts
+
+Covers the Windows piped-stdin path, which must fall back to the default
+instead of blocking when nothing is written to the pipe.
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils import user_prompt
+from utils.user_prompt import prompt_with_timeout, _read_line_windows
+
+
+@pytest.fixture
+def pipe_stdin(monkeypatch):
+    """Replace sys.stdin with the read end of a pipe and yield the write end"""
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, 'r')
+    monkeypatch.setattr(sys, 'stdin', reader)
+    try:
+        yield write_fd
+    finally:
+        # Closing the write end first lets any abandoned reader thread finish
+        os.close(write_fd)
+        reader.close()
+
+
+def test_idle_pipe_times_out(pipe_stdin):
+    """Test that an idle stdin pipe returns None after the timeout"""
+    started = time.monotonic()
+    line = _read_line_windows(0.2)
+    assert line is None
+    assert time.monotonic() - started < 2
+
+
+def test_pipe_line_is_read(pipe_stdin):
+    """Test that a line written to the stdin pipe is returned without its newline"""
+    os.write(pipe_stdin, b"drop\r\n")
+    assert _read_line_windows(1) == "drop"
+
+
+def test_prompt_defaults_on_idle_pipe(pipe_stdin, monkeypatch):
+    """Test that prompt_with_timeout falls back to the default on Windows with an idle pipe"""
+    monkeypatch.setattr(user_prompt.sys, 'platform', 'win32')
+    choice = prompt_with_timeout("Table exists", ['drop', 'skip'], timeout=0.2, default='skip')
+    assert choice == 'skip'
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
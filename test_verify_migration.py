@@ -0,0 +1,154 @@
+"""
+Test Migration Verification Row-Count Cache
+
+Drives verify_migration._fetch_stats() with a fake cursor to check which
+tables are re-counted and what is written back to the cache.
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+pyodbc = pytest.importorskip("pyodbc")
+
+import verify_migration
+
+
+TABLES = ['LOANS', 'LOAN_AUDIT', 'LOAN_PAYMENTS', 'LOAN_SCHEDULE', 'STG_LOAN_APPS']
+
+
+class FakeCursor:
+    """Answers the statements _fetch_stats() sends, one result set per statement"""
+
+    def __init__(self, counts, last_updates):
+        self.counts = counts
+        self.last_updates = last_updates
+        self.counted = []       # Tables sent to the row-count statement
+        self.description = None
+        self.arraysize = 1
+        self._pending = []
+        self._rows = []
+
+    def execute(self, sql, *params):
+        params = list(params)
+        self._pending = []
+        for statement in sql.split(';'):
+            if statement.strip():
+                placeholders = statement.count('?')
+                self._pending.append((statement, params[:placeholders]))
+                del params[:placeholders]
+        self.nextset()
+        return self
+
+    def nextset(self):
+        if not self._pending:
+            return False
+        statement, params = self._pending.pop(0)
+        self.description, self._rows = self._result(statement, params)
+        return True
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchmany(self, size):
+        return self._rows[:size]
+
+    def _result(self, statement, params):
+        if 'last_user_update' in statement:
+            rows = [(t, self.last_updates.get(t)) for t in params]
+            return [('name',), ('last',)], rows
+        if 'dm_db_partition_stats' in statement:
+            self.counted.extend(params)
+            rows = [(t, self.counts[t]) for t in params if t in self.counts]
+            return [('name',), ('rows',)], rows
+        if 'INFORMATION_SCHEMA' in statement:
+            return [('TABLE_NAME',), ('COLUMN_NAME',), ('DATA_TYPE',)], []
+        if 'TOP 5' in statement:
+            return [('LOAN_ID',)], []
+        raise AssertionError(f"unexpected statement: {statement}")
+
+
+@pytest.fixture
+def cache_env(tmp_path, monkeypatch):
+    """Point the cache at a temp file and fix the configured database"""
+    cache_path = tmp_path / '.verify_cache.json'
+    creds = {'server': 'srv', 'database': 'loans_db'}
+    monkeypatch.setattr(verify_migration, '_CACHE_PATH', str(cache_path))
+    monkeypatch.setattr(verify_migration, '_load_creds', lambda: creds)
+    return cache_path, creds
+
+
+def _fetch(counts, last_updates):
+    cursor = FakeCursor(counts, last_updates)
+    stats = verify_migration._fetch_stats(cursor)
+    return stats, cursor.counted
+
+
+def test_unchanged_tables_use_cached_counts(cache_env):
+    """Test that only tables with a new last write, or none recorded, are re-counted"""
+    cache_path, _ = cache_env
+    counts = dict.fromkeys(TABLES, 5)
+    updates = {'LOANS': '2026-01-01', 'LOAN_PAYMENTS': '2026-01-02'}
+
+    stats, counted = _fetch(counts, updates)
+    assert counted == TABLES
+    assert stats['counts'] == counts
+
+    cached = json.loads(cache_path.read_text())['srv/loans_db']
+    assert sorted(cached) == ['LOANS', 'LOAN_PAYMENTS']
+
+    # Same timestamps: cached tables are not counted, even if rows changed
+    counts['LOANS'] = 99
+    stats, counted = _fetch(counts, updates)
+    assert counted == ['LOAN_AUDIT', 'LOAN_SCHEDULE', 'STG_LOAN_APPS']
+    assert stats['counts']['LOANS'] == 5
+
+    # A newer write invalidates the entry
+    updates['LOANS'] = '2026-02-01'
+    stats, counted = _fetch(counts, updates)
+    assert 'LOANS' in counted
+    assert stats['counts']['LOANS'] == 99
+    assert json.loads(cache_path.read_text())['srv/loans_db']['LOANS'] == {
+        'last_update': '2026-02-01', 'row_count': 99,
+    }
+
+
+def test_cache_scoped_by_database(cache_env):
+    """Test that entries for one database are not reused for another"""
+    _, creds = cache_env
+    counts = dict.fromkeys(TABLES, 5)
+    updates = dict.fromkeys(TABLES, '2026-01-01')
+
+    _fetch(counts, updates)
+    creds['database'] = 'other_db'
+    _, counted = _fetch(counts, updates)
+
+    assert counted == TABLES
+
+
+def test_failed_counts_not_cached(cache_env, monkeypatch):
+    """Test that a table whose count failed is not written to the cache"""
+    cache_path, _ = cache_env
+    counts = dict.fromkeys(TABLES, 5)
+    del counts['LOAN_SCHEDULE']
+    updates = dict.fromkeys(TABLES, '2026-01-01')
+
+    monkeypatch.setattr(verify_migration, '_load_conn_str', lambda: 'DSN=unused')
+    monkeypatch.setattr(
+        verify_migration, '_count_rows',
+        lambda conn_str, table: (table, pyodbc.Error("Invalid object name")),
+    )
+
+    stats, _ = _fetch(counts, updates)
+
+    assert isinstance(stats['counts']['LOAN_SCHEDULE'], pyodbc.Error)
+    cached = json.loads(cache_path.read_text())['srv/loans_db']
+    assert 'LOAN_SCHEDULE' not in cached
+    assert len(cached) == len(TABLES) - 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
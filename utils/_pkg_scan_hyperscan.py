@@ -0,0 +1,84 @@
+"""
+Hyperscan keyword scanner for the universal package parser
+
+Optional accelerator for UniversalPackageParser. Importing this module
+raises ImportError when the hyperscan bindings are not installed, in which
+case the parser keeps using its regex scanners.
+
+One caseless multi-literal scan finds every PROCEDURE/FUNCTION candidate and
+every block keyword and quote in a package. Offsets are only meaningful for
+ASCII code, where byte and character positions coincide.
+"""
+
+from functools import lru_cache
+from typing import List, NamedTuple
+
+import hyperscan
+
+# Pattern ids double as indexes into this tuple
+_LITERALS = ("PROCEDURE", "FUNCTION", "BEGIN", "LOOP", "CASE", "END", "'", '"')
+_MEMBER_IDS = (0, 1)
+_QUOTE_IDS = (6, 7)
+
+
+class ScanTokens(NamedTuple):
+    """Keyword positions found in one package"""
+    member_starts: List[int]   # PROCEDURE/FUNCTION candidates (no boundary check)
+    block_starts: List[int]    # BEGIN/LOOP/CASE/END and quotes, ascending
+    block_tokens: List[str]    # Uppercased keyword or quote char per start
+
+
+def _compile_database() -> "hyperscan.Database":
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[lit.encode('ascii') for lit in _LITERALS],
+        ids=list(range(len(_LITERALS))),
+        elements=len(_LITERALS),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_LITERALS),
+    )
+    return db
+
+
+_DB = _compile_database()
+
+
+def _is_alnum(data: bytes, pos: int) -> bool:
+    return 0 <= pos < len(data) and chr(data[pos]).isalnum()
+
+
+@lru_cache(maxsize=1)
+def scan_tokens(code: str) -> ScanTokens:
+    """
+    Scan ASCII package code once for member and block keywords
+
+    Block keywords are kept only when not bounded by letters or digits, the
+    same rule the regex END scanner applies. Cached so all members of one
+    package share a single scan.
+    """
+    data = code.encode('ascii')
+    hits = []
+
+    def on_match(pattern_id, start, end, flags, context):
+        hits.append((start, pattern_id))
+
+    _DB.scan(data, match_event_handler=on_match)
+    hits.sort()
+
+    member_starts = []
+    block_starts = []
+    block_tokens = []
+
+    for start, pattern_id in hits:
+        if pattern_id in _MEMBER_IDS:
+            member_starts.append(start)
+        elif pattern_id in _QUOTE_IDS:
+            block_starts.append(start)
+            block_tokens.append(_LITERALS[pattern_id])
+        else:
+            literal = _LITERALS[pattern_id]
+            if _is_alnum(data, start - 1) or _is_alnum(data, start + len(literal)):
+                continue
+            block_starts.append(start)
+            block_tokens.append(literal)
+
+    return ScanTokens(member_starts, block_starts, block_tokens)
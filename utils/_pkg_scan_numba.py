@@ -0,0 +1,121 @@
+"""
+Numba-compiled block scanner for the universal package parser
+
+Optional accelerator for UniversalPackageParser._find_matching_end. Importing
+this module raises ImportError when numba/numpy are not installed, in which
+case the parser keeps using its regex scanner.
+
+The kernel walks an uppercased ASCII buffer and mirrors the regex scanner
+exactly: BEGIN/LOOP/CASE open a block, END closes one, keywords count only
+when not bounded by letters or digits, and quotes toggle string state unless
+escaped with a backslash.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numba import njit
+
+# Byte values used by the kernel
+_QUOTE = 39        # '
+_DQUOTE = 34       # "
+_BACKSLASH = 92    # \
+_SEMICOLON = 59    # ;
+
+
+@njit(cache=True)
+def _is_alnum(c):
+    return (48 <= c <= 57) or (65 <= c <= 90) or (97 <= c <= 122)
+
+
+@njit(cache=True)
+def _keyword_at(buf, i, n):
+    """Length of the block keyword starting at i, or 0"""
+    if i > 0 and _is_alnum(buf[i - 1]):
+        return 0
+
+    c = buf[i]
+    length = 0
+    if c == 66:  # B
+        if (i + 5 <= n and buf[i + 1] == 69 and buf[i + 2] == 71
+                and buf[i + 3] == 73 and buf[i + 4] == 78):
+            length = 5
+    elif c == 76:  # L
+        if (i + 4 <= n and buf[i + 1] == 79 and buf[i + 2] == 79
+                and buf[i + 3] == 80):
+            length = 4
+    elif c == 67:  # C
+        if (i + 4 <= n and buf[i + 1] == 65 and buf[i + 2] == 83
+                and buf[i + 3] == 69):
+            length = 4
+    elif c == 69:  # E
+        if i + 3 <= n and buf[i + 1] == 78 and buf[i + 2] == 68:
+            length = 3
+
+    if length and i + length < n and _is_alnum(buf[i + length]):
+        return 0
+    return length
+
+
+@njit(cache=True)
+def _find_end_kernel(buf, start):
+    n = buf.shape[0]
+    depth = 1
+    in_string = False
+    string_char = 0
+
+    i = start
+    while i < n:
+        c = buf[i]
+
+        # Handle strings
+        if c == _QUOTE or c == _DQUOTE:
+            if i == 0 or buf[i - 1] != _BACKSLASH:
+                if not in_string:
+                    in_string = True
+                    string_char = c
+                elif c == string_char:
+                    in_string = False
+            i += 1
+            continue
+
+        length = _keyword_at(buf, i, n)
+        if length == 0:
+            i += 1
+            continue
+
+        if not in_string:
+            if length != 3:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    # Find semicolon
+                    for j in range(i, n):
+                        if buf[j] == _SEMICOLON:
+                            return j + 1
+                    return i + length
+
+        i += length
+
+    return -1
+
+
+@lru_cache(maxsize=1)
+def _as_buffer(code_upper: str) -> np.ndarray:
+    """uint8 view of an uppercased ASCII package, shared by all its members"""
+    return np.frombuffer(code_upper.encode('ascii'), dtype=np.uint8)
+
+
+def find_end(code_upper: str, start: int) -> int:
+    """
+    Find the end of the block opened before start
+
+    Args:
+        code_upper: Uppercased ASCII package code
+        start: Offset to start scanning from
+
+    Returns:
+        Offset just past the terminating semicolon, or -1 if unmatched
+    """
+    return int(_find_end_kernel(_as_buffer(code_upper), start))
@@ -12,12 +12,42 @@ Key principle: "Discover, Separate, Parse" - find all packages, extract each, pa
 """
 
 import re
+import copy
+import hashlib
 import logging
+from bisect import bisect_right
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# Parsed results keyed by a digest of the package source, so pipelines that
+# request several packages from the same file only parse it once
+_PARSE_CACHE_MAXSIZE = 32
+_PARSE_CACHE: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+
+# CREATE [OR REPLACE] PACKAGE [BODY] [schema.]name - group 1 set for bodies
+_PACKAGE_HEADER_RE = re.compile(
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+(BODY\s+)?(?:[\w\.]+\.)?([\w$#]+)',
+    re.IGNORECASE
+)
+
+# Comments and string literals, where PROCEDURE/FUNCTION are not declarations
+_MASK_RE = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'", re.DOTALL)
+
+
+def _masked_spans(code: str) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """Comment/string regions of code, sorted by start, plus their starts"""
+    masked = [(m.start(), m.end()) for m in _MASK_RE.finditer(code)]
+    return masked, [start for start, _ in masked]
+
+
+def _is_masked(pos: int, masked: List[Tuple[int, int]], masked_starts: List[int]) -> bool:
+    """Check if position falls inside a comment or string literal"""
+    i = bisect_right(masked_starts, pos) - 1
+    return i >= 0 and masked[i][1] > pos
+
 
 @dataclass
 class PackageMember:
@@ -75,44 +105,50 @@ class MultiPackageDiscovery:
         """
         packages = {}
 
-        # Find all package specifications
+        # Find all package headers (spec and body) in one scan
         # Pattern 1: With CREATE statement (from .sql files)
-        spec_pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+(?!BODY)\s*(?:[\w\.]+\.)?([\w$#]+)'
-        for match in re.finditer(spec_pattern, code, re.IGNORECASE):
-            pkg_name = match.group(1).upper()
-            start_pos = match.start()
-
-            # Find the end of this package spec (END package_name; or END;)
-            end_pos = self._find_package_end(code, start_pos, pkg_name)
-
-            if pkg_name not in packages:
-                packages[pkg_name] = PackageInfo(name=pkg_name)
-
-            packages[pkg_name].spec_start = start_pos
-            packages[pkg_name].spec_end = end_pos
-            if end_pos > start_pos:
-                packages[pkg_name].spec_code = code[start_pos:end_pos]
-
-            self.logger.info(f"Discovered package spec: {pkg_name} ({start_pos}-{end_pos})")
+        # Headers quoted in comments or strings (e.g. EXECUTE IMMEDIATE) are
+        # not package boundaries
+        masked, masked_starts = _masked_spans(code)
+        headers = [
+            m for m in _PACKAGE_HEADER_RE.finditer(code)
+            if not _is_masked(m.start(), masked, masked_starts)
+        ]
+
+        # Each package ends before the next header starts
+        header_positions = [m.start() for m in headers] + [len(code)]
+
+        # Specs first, then bodies, so packages keep their spec order
+        for want_body in (False, True):
+            kind = "body" if want_body else "spec"
+            for i, match in enumerate(headers):
+                if bool(match.group(1)) != want_body:
+                    continue
 
-        # Find all package bodies
-        body_pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+BODY\s+(?:[\w\.]+\.)?([\w$#]+)'
-        for match in re.finditer(body_pattern, code, re.IGNORECASE):
-            pkg_name = match.group(1).upper()
-            start_pos = match.start()
+                pkg_name = match.group(2).upper()
+                start_pos = match.start()
 
-            # Find the end of this package body
-            end_pos = self._find_package_end(code, start_pos, pkg_name)
+                # Find the end of this package (END package_name; or END;)
+                end_pos = self._find_package_end(
+                    code, start_pos, pkg_name, end_hint=header_positions[i + 1]
+                )
 
-            if pkg_name not in packages:
-                packages[pkg_name] = PackageInfo(name=pkg_name)
+                if pkg_name not in packages:
+                    packages[pkg_name] = PackageInfo(name=pkg_name)
 
-            packages[pkg_name].body_start = start_pos
-            packages[pkg_name].body_end = end_pos
-            if end_pos > start_pos:
-                packages[pkg_name].body_code = code[start_pos:end_pos]
+                info = packages[pkg_name]
+                if want_body:
+                    info.body_start = start_pos
+                    info.body_end = end_pos
+                    if end_pos > start_pos:
+                        info.body_code = code[start_pos:end_pos]
+                else:
+                    info.spec_start = start_pos
+                    info.spec_end = end_pos
+                    if end_pos > start_pos:
+                        info.spec_code = code[start_pos:end_pos]
 
-            self.logger.info(f"Discovered package body: {pkg_name} ({start_pos}-{end_pos})")
+                self.logger.info(f"Discovered package {kind}: {pkg_name} ({start_pos}-{end_pos})")
 
         # Pattern 2: Raw package code (from USER_SOURCE) without CREATE
         # This handles code like: "PACKAGE pkg_name IS ... END;"
@@ -153,10 +189,18 @@ class MultiPackageDiscovery:
 
         return discovered
 
-    def _find_package_end(self, code: str, start_pos: int, package_name: str) -> int:
-        """Find the end of a package (spec or body)"""
+    def _find_package_end(self, code: str, start_pos: int, package_name: str,
+                          end_hint: Optional[int] = None) -> int:
+        """
+        Find the end of a package (spec or body)
+
+        end_hint bounds the search (normally the start of the next package
+        header) so the END of a following package is never picked up.
+        """
         # Look for END package_name; or END;
-        search_area = code[start_pos:start_pos + 50000]  # Search up to 50k chars
+        if end_hint is None:
+            end_hint = len(code)
+        search_area = code[start_pos:end_hint]
 
         # Try to find END with package name
         end_pattern = r'\bEND\s+' + re.escape(package_name) + r'\s*;'
@@ -196,9 +240,18 @@ class UniversalPackageParser:
         # Combine spec and body for analysis
         combined_code = (spec_code or "") + "\n" + (body_code or "")
 
+        # Comment/string regions, sorted by start, to skip keywords inside them
+        masked, masked_starts = _masked_spans(combined_code)
+
         # Find all procedure and function locations
-        proc_locations = self._find_all_keywords(combined_code, 'PROCEDURE')
-        func_locations = self._find_all_keywords(combined_code, 'FUNCTION')
+        proc_locations = [
+            loc for loc in self._find_all_keywords(combined_code, 'PROCEDURE')
+            if not _is_masked(loc, masked, masked_starts)
+        ]
+        func_locations = [
+            loc for loc in self._find_all_keywords(combined_code, 'FUNCTION')
+            if not _is_masked(loc, masked, masked_starts)
+        ]
 
         self.logger.info(f"  Found {len(proc_locations)} PROCEDURE keywords, {len(func_locations)} FUNCTION keywords")
 
@@ -571,6 +624,32 @@ class MultiPackageUniversalParser:
         }
 
 
+def _parse_all_cached(package_code: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse all packages in the code, reusing the result for identical code
+
+    The cached results are shared and must not be modified; the public
+    functions below hand out deep copies.
+    """
+    key = hashlib.blake2b(
+        package_code.encode('utf-8', 'surrogatepass'), digest_size=16
+    ).hexdigest()
+
+    results = _PARSE_CACHE.get(key)
+    if results is not None:
+        _PARSE_CACHE.move_to_end(key)
+        return results
+
+    parser = MultiPackageUniversalParser()
+    results = parser.parse_all_packages(package_code)
+
+    _PARSE_CACHE[key] = results
+    if len(_PARSE_CACHE) > _PARSE_CACHE_MAXSIZE:
+        _PARSE_CACHE.popitem(last=False)
+
+    return results
+
+
 def decompose_oracle_package(package_name: str, package_code: str) -> Dict[str, Any]:
     """
     Universal package decomposition - handles multiple packages automatically
@@ -583,17 +662,17 @@ def decompose_oracle_package(package_name: str, package_code: str) -> Dict[str,
         If single package: Result for that package
         If multiple packages: Result for the requested package (or first one)
     """
-    parser = MultiPackageUniversalParser()
-    all_results = parser.parse_all_packages(package_code)
+    all_results = _parse_all_cached(package_code)
 
-    # If specific package requested, return that
+    # If specific package requested, return that. Results are copied so
+    # callers can edit members without touching the parse cache.
     if package_name.upper() in all_results:
-        return all_results[package_name.upper()]
+        return copy.deepcopy(all_results[package_name.upper()])
 
     # Otherwise return first package found
     if all_results:
         first_pkg = list(all_results.values())[0]
-        return first_pkg
+        return copy.deepcopy(first_pkg)
 
     # No packages found
     logger.warning(f"No packages found in code")
@@ -617,7 +696,7 @@ def decompose_all_packages(package_code: str) -> Dict[str, Dict[str, Any]]:
     """
     Decompose ALL packages in the code
 
-    Returns: Dictionary mapping package_name -> result
+    Returns: Dictionary mapping package_name -> result (a copy the caller
+    may modify)
     """
-    parser = MultiPackageUniversalParser()
-    return parser.parse_all_packages(package_code)
+    return copy.deepcopy(_parse_all_cached(package_code))
@@ -11,14 +11,142 @@ Key principle: "Find first, extract later" - discover all members then extract d
 """
 
 import re
+import sys
 import logging
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns - parse() runs these on every package
+# SQL*Plus commands and "/" terminator lines, stripped in a single pass
+_NORMALIZE_RE = re.compile(
+    r'^(?:SET|SHOW|SPOOL|PROMPT|WHENEVER)[^\n]*$|^\s*/\s*$',
+    re.MULTILINE | re.IGNORECASE
+)
+
+_PKG_NAME_RES = (
+    re.compile(r'PACKAGE\s+BODY\s+(?:[\w\.]+\.)?([\w$#]+)', re.IGNORECASE),
+    re.compile(r'PACKAGE\s+(?:[\w\.]+\.)?([\w$#]+)\s+(?:IS|AS)', re.IGNORECASE),
+)
+_PKG_SPEC_RE = re.compile(
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+(?!BODY)[\s\S]*?END\s+[\w$#]*\s*;',
+    re.IGNORECASE
+)
+_PKG_BODY_RE = re.compile(
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+BODY[\s\S]*?END\s+[\w$#]*\s*;',
+    re.IGNORECASE
+)
+
+# PROCEDURE/FUNCTION keyword and member name, found in a single scan. The name
+# is captured in a lookahead so a keyword in the name slot is still scanned.
+_MEMBER_RE = re.compile(r'\b(PROCEDURE|FUNCTION)\b(?=\s+([\w$#]+))', re.IGNORECASE)
+# Comments and string literals, masked out of member discovery
+_MASK_RE = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'", re.DOTALL)
+_RETURN_RE = re.compile(r'\s*RETURNS?\s+([\w%]+(?:\([^)]*\))?)', re.IGNORECASE)
+_IS_AS_RE = re.compile(r'\s*(?:IS|AS)\s+', re.IGNORECASE)
+_SEMI_RE = re.compile(r'\s*;')
+_PARAM_PUNCT_RE = re.compile(r'[(),]')
+
+# How far past the parameter list the extractors look for RETURN, and for
+# the IS/AS or ';' that decides between implementation and declaration
+_RETURN_WINDOW = 500
+_DECISION_WINDOW = 200
+
+# Block keywords (bounded by non-alphanumerics) or a quote character. The
+# case-sensitive variant runs over an uppercased copy of ASCII code.
+_END_TOK_RE = re.compile(r"(?<![^\W_])(BEGIN|LOOP|CASE|END)(?![^\W_])|(['\"])", re.IGNORECASE)
+_END_TOK_UPPER_RE = re.compile(r"(?<![^\W_])(BEGIN|LOOP|CASE|END)(?![^\W_])|(['\"])")
+# Keyword-only variants for blocks with no quotes left to track
+_END_KW_RE = re.compile(r"(?<![^\W_])(BEGIN|LOOP|CASE|END)(?![^\W_])", re.IGNORECASE)
+_END_KW_UPPER_RE = re.compile(r"(?<![^\W_])(BEGIN|LOOP|CASE|END)(?![^\W_])")
+
+# Packages longer than this use the compiled block scanner when available
+_FAST_SCAN_MIN_LEN = 4096
+
+# Compiled block scanner for large packages (optional, needs numba). Resolved
+# once here: a failed import is not cached, so retrying it per parser is slow.
+try:
+    from ._pkg_scan_numba import find_end as _FAST_FIND_END
+except ImportError:
+    _FAST_FIND_END = None
+
+# Multi-literal keyword scanner (optional, needs hyperscan). The backend
+# compiles its pattern database at import, so any failure there disables it.
+try:
+    from ._pkg_scan_hyperscan import scan_tokens as _SCAN_TOKENS
+except Exception:
+    _SCAN_TOKENS = None
+
+# Slotted members drop the per-instance __dict__ (dataclass slots need 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@lru_cache(maxsize=1)
+def _ascii_upper(code: str) -> Optional[str]:
+    """
+    Uppercased copy of code, or None if code is not ASCII
+
+    ASCII uppercasing keeps every offset and word boundary intact. Cached so
+    all members of one package share a single copy.
+    """
+    return code.upper() if code.isascii() else None
+
+
+@lru_cache(maxsize=1)
+def _last_quote(code: str) -> int:
+    """Offset of the last quote character in code, or -1"""
+    return max(code.rfind("'"), code.rfind('"'))
+
+
+def _scan_parens(text: str, start: int) -> Tuple[str, int]:
+    """
+    Scan a parenthesised parameter list starting at start (after whitespace)
+
+    Linear walk that tracks nesting depth and skips parens inside string
+    literals. Returns (params_str, end_index); ("", start) when there is
+    no balanced list.
+    """
+    length = len(text)
+    pos = start
+    while pos < length and text[pos].isspace():
+        pos += 1
+
+    if pos >= length or text[pos] != '(':
+        return "", start
+
+    open_pos = pos
+    depth = 0
+    in_string = False
+    string_char = None
+
+    while pos < length:
+        char = text[pos]
+
+        if char in ("'", '"') and text[pos-1] != '\\':
+            if not in_string:
+                in_string = True
+                string_char = char
+            elif char == string_char:
+                in_string = False
+        elif not in_string:
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0:
+                    return text[open_pos:pos + 1], pos + 1
+
+        pos += 1
+
+    return "", start
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class PackageMember:
     """Represents a procedure or function within a package"""
     name: str
@@ -29,6 +157,11 @@ class PackageMember:
     parameters: List[str] = field(default_factory=list)
     is_public: bool = True
     overload_index: int = 0
+    upper_name: str = field(default="", init=False, repr=False)
+
+    def __post_init__(self):
+        # Case-folded grouping key, computed once per member
+        self.upper_name = sys.intern(self.name.upper())
 
     def get_sql_server_name(self, package_name: str) -> str:
         """Generate SQL Server object name"""
@@ -52,6 +185,12 @@ class UniversalPackageParser:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
+        # Compiled block scanner for large packages (None without numba)
+        self._fast_find_end = _FAST_FIND_END
+
+        # Multi-literal keyword scanner (None without hyperscan)
+        self._scan_tokens = _SCAN_TOKENS
+
     def parse(self, package_code: str) -> Dict[str, Any]:
         """Parse package code universally"""
         self.logger.info("Starting universal package parsing")
@@ -62,27 +201,43 @@ class UniversalPackageParser:
         # Extract package name
         package_name = self._extract_package_name(code)
 
-        # Separate spec and body (if both present)
-        spec, body = self._separate_spec_and_body(code)
+        # Locate spec and body (if both present) as offsets into code
+        (spec_start, spec_end), _ = self._separate_spec_and_body(code)
 
-        # Find all procedure and function locations
-        proc_locations = self._find_all_keywords(code, 'PROCEDURE')
-        func_locations = self._find_all_keywords(code, 'FUNCTION')
+        # Find and extract all procedures and functions in one pass
+        procedures = []
+        functions = []
 
-        self.logger.info(f"Found {len(proc_locations)} PROCEDURE keywords, {len(func_locations)} FUNCTION keywords")
+        if self._scan_tokens is not None and code.isascii():
+            candidates = self._scan_tokens(code).member_starts
+            matches = filter(None, (_MEMBER_RE.match(code, pos) for pos in candidates))
+        else:
+            matches = _MEMBER_RE.finditer(code)
 
-        # Extract each member
-        all_members = []
+        # Ignore PROCEDURE/FUNCTION mentioned in comments or strings
+        mask = self._mask_comments_and_strings(code)
 
-        for loc in proc_locations:
-            member = self._extract_procedure_at(code, loc, in_spec=(spec and loc < len(spec)))
-            if member:
-                all_members.append(member)
+        for match in matches:
+            loc = match.start()
+            if mask[loc]:
+                continue
+
+            in_spec = spec_start <= loc < spec_end
+
+            if match.group(1).upper() == 'PROCEDURE':
+                member = self._extract_procedure_at(code, loc, match.group(2), match.end(2), in_spec)
+                found = procedures
+            else:
+                member = self._extract_function_at(code, loc, match.group(2), match.end(2), in_spec)
+                found = functions
 
-        for loc in func_locations:
-            member = self._extract_function_at(code, loc, in_spec=(spec and loc < len(spec)))
             if member:
-                all_members.append(member)
+                found.append(member)
+
+        self.logger.info(f"Found {len(procedures)} procedures, {len(functions)} functions")
+
+        # Procedures first, then functions
+        all_members = procedures + functions
 
         # Match spec declarations with body implementations
         matched_members = self._match_and_merge(all_members)
@@ -93,98 +248,75 @@ class UniversalPackageParser:
 
     def _normalize(self, code: str) -> str:
         """Normalize code for consistent parsing"""
-        # Remove SQL*Plus commands
-        code = re.sub(r'^(?:SET|SHOW|SPOOL|PROMPT|WHENEVER).*$', '', code, flags=re.MULTILINE | re.IGNORECASE)
-
         # Normalize line endings
         code = code.replace('\r\n', '\n').replace('\r', '\n')
 
-        # Remove slash delimiters
-        code = re.sub(r'^\s*/\s*$', '', code, flags=re.MULTILINE)
+        # Remove SQL*Plus commands and slash delimiters
+        return _NORMALIZE_RE.sub('', code)
 
-        return code
+    def _mask_comments_and_strings(self, code: str) -> bytearray:
+        """Per-character flags, non-zero inside comments and string literals"""
+        mask = bytearray(len(code))
+        for match in _MASK_RE.finditer(code):
+            start, end = match.span()
+            mask[start:end] = b'\x01' * (end - start)
+        return mask
 
     def _extract_package_name(self, code: str) -> str:
         """Extract package name"""
-        patterns = [
-            r'PACKAGE\s+BODY\s+(?:[\w\.]+\.)?([\w$#]+)',
-            r'PACKAGE\s+(?:[\w\.]+\.)?([\w$#]+)\s+(?:IS|AS)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, code, re.IGNORECASE)
+        for pattern in _PKG_NAME_RES:
+            match = pattern.search(code)
             if match:
                 return match.group(1).upper()
 
         return "UNKNOWN_PACKAGE"
 
-    def _separate_spec_and_body(self, code: str) -> Tuple[str, str]:
-        """Separate package specification and body"""
-        spec = ""
-        body = ""
+    def _separate_spec_and_body(self, code: str) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+        Separate package specification and body
+
+        Returns (start, end) offsets into code for the spec and the body;
+        (-1, -1) when not present. Slice code to get the text.
+        """
+        spec_span = (-1, -1)
+        body_span = (-1, -1)
 
         # Find spec (CREATE PACKAGE ... END;)
-        spec_match = re.search(
-            r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+(?!BODY)[\s\S]*?END\s+[\w$#]*\s*;',
-            code,
-            re.IGNORECASE
-        )
+        spec_match = _PKG_SPEC_RE.search(code)
         if spec_match:
-            spec = spec_match.group(0)
+            spec_span = spec_match.span()
 
         # Find body (CREATE PACKAGE BODY ... END;)
-        body_match = re.search(
-            r'CREATE\s+(?:OR\s+REPLACE\s+)?PACKAGE\s+BODY[\s\S]*?END\s+[\w$#]*\s*;',
-            code,
-            re.IGNORECASE
-        )
+        body_match = _PKG_BODY_RE.search(code)
         if body_match:
-            body = body_match.group(0)
+            body_span = body_match.span()
 
-        return spec, body
+        return spec_span, body_span
 
-    def _find_all_keywords(self, code: str, keyword: str) -> List[int]:
-        """Find all positions of a keyword (word boundary)"""
-        pattern = r'\b' + keyword + r'\b'
-        return [m.start() for m in re.finditer(pattern, code, re.IGNORECASE)]
-
-    def _extract_procedure_at(self, code: str, position: int, in_spec: bool = False) -> Optional[PackageMember]:
-        """Extract procedure starting at position"""
+    def _extract_procedure_at(self, code: str, position: int, name: str, name_end: int,
+                              in_spec: bool = False) -> Optional[PackageMember]:
+        """Extract procedure starting at position (name already matched, ending at name_end)"""
         try:
-            # Get remaining code from this position
-            remaining = code[position:]
-
-            # Extract name - first identifier after PROCEDURE
-            name_match = re.match(r'PROCEDURE\s+([\w$#]+)', remaining, re.IGNORECASE)
-            if not name_match:
-                return None
-
-            name = name_match.group(1)
-            after_name_pos = name_match.end()
-
+            # All offsets are absolute positions in code - no tail copies
             # Find parameters - look for opening paren or IS/AS
-            params_str = ""
-            rest = remaining[after_name_pos:]
-
-            # Try to find parameter list
-            param_match = re.match(r'\s*(\([^)]*(?:\([^)]*\)[^)]*)*\))', rest, re.IGNORECASE)
-            if param_match:
-                params_str = param_match.group(1)
-                after_params_pos = after_name_pos + param_match.end()
-            else:
-                after_params_pos = after_name_pos
+            params_str, after_params_pos = _scan_parens(code, name_end)
 
             # Check if this is a declaration (ends with ;) or implementation (has IS/AS)
-            check_rest = remaining[after_params_pos:after_params_pos + 200]
+            # within the next 200 characters
+            window_end = after_params_pos + _DECISION_WINDOW
 
-            # Find next significant keyword
-            is_match = re.search(r'\s*(?:IS|AS)\s+', check_rest, re.IGNORECASE)
-            semi_match = re.search(r'\s*;', check_rest)
+            # Cheapest test first: a ';' right after the parameters is a declaration
+            is_match = None
+            semi_match = _SEMI_RE.match(code, after_params_pos, window_end)
+            if not semi_match:
+                # Find next significant keyword
+                is_match = _IS_AS_RE.search(code, after_params_pos, window_end)
+                semi_match = _SEMI_RE.search(code, after_params_pos, window_end)
 
             if semi_match and (not is_match or semi_match.start() < is_match.start()):
                 # Declaration only
-                end_pos = after_params_pos + semi_match.end()
-                full_text = remaining[:end_pos]
+                end_pos = semi_match.end()
+                full_text = code[position:end_pos]
 
                 return PackageMember(
                     name=name,
@@ -197,11 +329,11 @@ class UniversalPackageParser:
 
             if is_match:
                 # Has body - find the matching END
-                body_start = after_params_pos + is_match.end()
-                body_end = self._find_matching_end(remaining, body_start, name)
+                body_start = is_match.end()
+                body_end = self._find_matching_end(code, body_start, name)
 
                 if body_end > 0:
-                    full_text = remaining[:body_end]
+                    full_text = code[position:body_end]
 
                     return PackageMember(
                         name=name,
@@ -217,50 +349,36 @@ class UniversalPackageParser:
 
         return None
 
-    def _extract_function_at(self, code: str, position: int, in_spec: bool = False) -> Optional[PackageMember]:
-        """Extract function starting at position"""
+    def _extract_function_at(self, code: str, position: int, name: str, name_end: int,
+                             in_spec: bool = False) -> Optional[PackageMember]:
+        """Extract function starting at position (name already matched, ending at name_end)"""
         try:
-            remaining = code[position:]
-
-            # Extract name
-            name_match = re.match(r'FUNCTION\s+([\w$#]+)', remaining, re.IGNORECASE)
-            if not name_match:
-                return None
-
-            name = name_match.group(1)
-            after_name_pos = name_match.end()
-
+            # All offsets are absolute positions in code - no tail copies
             # Find parameters
-            params_str = ""
-            rest = remaining[after_name_pos:]
-
-            param_match = re.match(r'\s*(\([^)]*(?:\([^)]*\)[^)]*)*\))?', rest, re.IGNORECASE)
-            if param_match and param_match.group(1):
-                params_str = param_match.group(1)
-                after_params_pos = after_name_pos + param_match.end()
-            else:
-                after_params_pos = after_name_pos
+            params_str, after_params_pos = _scan_parens(code, name_end)
 
             # Find RETURN/RETURNS keyword and type
-            return_rest = remaining[after_params_pos:after_params_pos + 500]
-            return_match = re.search(r'\s*RETURNS?\s+([\w%]+(?:\([^)]*\))?)', return_rest, re.IGNORECASE)
+            return_match = _RETURN_RE.search(code, after_params_pos, after_params_pos + _RETURN_WINDOW)
 
             if not return_match:
                 return None
 
             return_type = return_match.group(1)
-            after_return_pos = after_params_pos + return_match.end()
+            after_return_pos = return_match.end()
 
             # Check for declaration vs implementation
-            check_rest = remaining[after_return_pos:after_return_pos + 200]
+            window_end = after_return_pos + _DECISION_WINDOW
 
-            is_match = re.search(r'\s*(?:IS|AS)\s+', check_rest, re.IGNORECASE)
-            semi_match = re.search(r'\s*;', check_rest)
+            is_match = None
+            semi_match = _SEMI_RE.match(code, after_return_pos, window_end)
+            if not semi_match:
+                is_match = _IS_AS_RE.search(code, after_return_pos, window_end)
+                semi_match = _SEMI_RE.search(code, after_return_pos, window_end)
 
             if semi_match and (not is_match or semi_match.start() < is_match.start()):
                 # Declaration only
-                end_pos = after_return_pos + semi_match.end()
-                full_text = remaining[:end_pos]
+                end_pos = semi_match.end()
+                full_text = code[position:end_pos]
 
                 return PackageMember(
                     name=name,
@@ -274,11 +392,11 @@ class UniversalPackageParser:
 
             if is_match:
                 # Has body
-                body_start = after_return_pos + is_match.end()
-                body_end = self._find_matching_end(remaining, body_start, name)
+                body_start = is_match.end()
+                body_end = self._find_matching_end(code, body_start, name)
 
                 if body_end > 0:
-                    full_text = remaining[:body_end]
+                    full_text = code[position:body_end]
 
                     return PackageMember(
                         name=name,
@@ -298,61 +416,116 @@ class UniversalPackageParser:
     def _find_matching_end(self, code: str, start_pos: int, member_name: str = None) -> int:
         """Find the matching END for a block"""
         depth = 1
-        pos = start_pos
         in_string = False
         string_char = None
 
-        while pos < len(code) and depth > 0:
-            char = code[pos]
+        code_upper = _ascii_upper(code)
+        if (code_upper is not None and self._fast_find_end is not None
+                and len(code) > _FAST_SCAN_MIN_LEN):
+            return self._fast_find_end(code_upper, start_pos)
+
+        if code_upper is not None and self._scan_tokens is not None:
+            return self._walk_tokens(code_upper, self._scan_tokens(code), start_pos)
+
+        # Nothing to track as a string past the last quote
+        if start_pos > _last_quote(code):
+            if code_upper is not None:
+                return self._scan_no_strings(code_upper, start_pos, _END_KW_UPPER_RE)
+            return self._scan_no_strings(code, start_pos, _END_KW_RE)
+
+        if code_upper is not None:
+            scan, token_re = code_upper, _END_TOK_UPPER_RE
+        else:
+            scan, token_re = code, _END_TOK_RE
+
+        # Jump between block keywords and quotes instead of walking every char
+        for match in token_re.finditer(scan, start_pos):
+            quote = match.group(2)
 
             # Handle strings
-            if char in ("'", '"') and (pos == 0 or code[pos-1] != '\\'):
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char:
-                    in_string = False
+            if quote:
+                pos = match.start()
+                if pos == 0 or scan[pos-1] != '\\':
+                    if not in_string:
+                        in_string = True
+                        string_char = quote
+                    elif quote == string_char:
+                        in_string = False
+                continue
+
+            if in_string:
+                continue
+
+            # BEGIN/LOOP/CASE increase depth, END (the only 3-letter one) closes a block
+            if match.end(1) - match.start(1) != 3:
+                depth += 1
+                continue
 
-            if not in_string:
-                # Check for keywords that increase depth
-                if code[pos:pos+5].upper() == 'BEGIN' and self._is_word_boundary(code, pos, pos+5):
-                    depth += 1
-                    pos += 5
-                    continue
-
-                if code[pos:pos+4].upper() == 'LOOP' and self._is_word_boundary(code, pos, pos+4):
-                    depth += 1
-                    pos += 4
-                    continue
-
-                if code[pos:pos+4].upper() == 'CASE' and self._is_word_boundary(code, pos, pos+4):
-                    depth += 1
-                    pos += 4
-                    continue
-
-                # Check for END
-                if code[pos:pos+3].upper() == 'END' and self._is_word_boundary(code, pos, pos+3):
-                    depth -= 1
-                    if depth == 0:
-                        # Find semicolon
-                        semi_pos = code.find(';', pos)
-                        if semi_pos != -1:
-                            return semi_pos + 1
-                        return pos + 3
-                    pos += 3
-                    continue
-
-            pos += 1
+            depth -= 1
+            if depth == 0:
+                # Find semicolon
+                semi_pos = scan.find(';', match.start())
+                if semi_pos != -1:
+                    return semi_pos + 1
+                return match.end()
+
+        return -1
+
+    def _walk_tokens(self, scan: str, tokens: Any, start_pos: int) -> int:
+        """_find_matching_end over keyword positions from the hyperscan backend"""
+        depth = 1
+        in_string = False
+        string_char = None
+
+        first = bisect_left(tokens.block_starts, start_pos)
+        for pos, token in zip(islice(tokens.block_starts, first, None),
+                              islice(tokens.block_tokens, first, None)):
+            # Handle strings
+            if token in ("'", '"'):
+                if pos == 0 or scan[pos-1] != '\\':
+                    if not in_string:
+                        in_string = True
+                        string_char = token
+                    elif token == string_char:
+                        in_string = False
+                continue
+
+            if in_string:
+                continue
+
+            if token != 'END':
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 0:
+                # Find semicolon
+                semi_pos = scan.find(';', pos)
+                if semi_pos != -1:
+                    return semi_pos + 1
+                return pos + 3
 
         return -1
 
-    def _is_word_boundary(self, code: str, start: int, end: int) -> bool:
-        """Check if position is a word boundary"""
-        if start > 0 and code[start-1].isalnum():
-            return False
-        if end < len(code) and code[end].isalnum():
-            return False
-        return True
+    def _scan_no_strings(self, scan: str, start_pos: int, keyword_re: re.Pattern) -> int:
+        """_find_matching_end for a range known to contain no quotes"""
+        depth = 1
+
+        for match in keyword_re.finditer(scan, start_pos):
+            # BEGIN/LOOP/CASE increase depth, END (the only 3-letter one) closes a block
+            if match.end(1) - match.start(1) != 3:
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 0:
+                # Find semicolon
+                semi_pos = scan.find(';', match.start())
+                if semi_pos != -1:
+                    return semi_pos + 1
+                return match.end()
+
+        return -1
 
     def _parse_params(self, params_str: str) -> List[str]:
         """Parse parameter string into list"""
@@ -366,45 +539,46 @@ class UniversalPackageParser:
 
         # Split by comma, respecting parentheses
         params = []
-        current = ""
+        start = 0
         depth = 0
 
-        for char in params_str:
+        for match in _PARAM_PUNCT_RE.finditer(params_str):
+            char = match.group()
             if char == '(':
                 depth += 1
-                current += char
             elif char == ')':
                 depth -= 1
-                current += char
-            elif char == ',' and depth == 0:
-                if current.strip():
-                    params.append(current.strip())
-                current = ""
-            else:
-                current += char
+            elif depth == 0:
+                part = params_str[start:match.start()].strip()
+                if part:
+                    params.append(part)
+                start = match.end()
 
-        if current.strip():
-            params.append(current.strip())
+        part = params_str[start:].strip()
+        if part:
+            params.append(part)
 
         return params
 
     def _match_and_merge(self, members: List[PackageMember]) -> List[PackageMember]:
         """Match specification declarations with body implementations"""
         # Group by name
-        by_name = {}
+        by_name = defaultdict(list)
         for member in members:
-            key = member.name.upper()
-            if key not in by_name:
-                by_name[key] = []
-            by_name[key].append(member)
+            by_name[member.upper_name].append(member)
 
         # Merge spec and body for each
         merged = []
 
-        for name, group in by_name.items():
-            # Find spec (is_public=True, no body) and impl (has body)
-            spec = next((m for m in group if m.is_public and not m.body), None)
-            impl = next((m for m in group if m.body), None)
+        for group in by_name.values():
+            # Find first spec (is_public=True, no body) and first impl (has body)
+            spec = impl = None
+            for m in group:
+                if m.body:
+                    if impl is None:
+                        impl = m
+                elif m.is_public and spec is None:
+                    spec = m
 
             if spec and impl:
                 # Merge: use spec metadata, impl body
@@ -421,30 +595,43 @@ class UniversalPackageParser:
 
     def _build_result(self, package_name: str, members: List[PackageMember]) -> Dict[str, Any]:
         """Build final result dictionary"""
-        procedures = [m for m in members if m.member_type == 'PROCEDURE']
-        functions = [m for m in members if m.member_type == 'FUNCTION']
+        total_procedures = total_functions = 0
 
         components = []
         for member in members:
-            component = {
-                "name": member.get_sql_server_name(package_name),
-                "original_name": member.name,
-                "type": member.member_type,
-                "visibility": "public" if member.is_public else "private",
-                "oracle_code": member.body if member.body else member.specification,
-                "migration_action": "CONVERT_TO_STANDALONE"
-            }
+            if member.member_type == 'PROCEDURE':
+                total_procedures += 1
+            elif member.member_type == 'FUNCTION':
+                total_functions += 1
+
+            # Build each component with its full key set in one literal
             if member.member_type == 'FUNCTION':
-                component["return_type"] = member.return_type
-            components.append(component)
+                components.append({
+                    "name": member.get_sql_server_name(package_name),
+                    "original_name": member.name,
+                    "type": member.member_type,
+                    "visibility": "public" if member.is_public else "private",
+                    "oracle_code": member.body if member.body else member.specification,
+                    "migration_action": "CONVERT_TO_STANDALONE",
+                    "return_type": member.return_type
+                })
+            else:
+                components.append({
+                    "name": member.get_sql_server_name(package_name),
+                    "original_name": member.name,
+                    "type": member.member_type,
+                    "visibility": "public" if member.is_public else "private",
+                    "oracle_code": member.body if member.body else member.specification,
+                    "migration_action": "CONVERT_TO_STANDALONE"
+                })
 
         return {
             "package_name": package_name,
             "members": members,
             "global_variables": [],
             "initialization": "",
-            "total_procedures": len(procedures),
-            "total_functions": len(functions),
+            "total_procedures": total_procedures,
+            "total_functions": total_functions,
             "migration_plan": {
                 "package_name": package_name,
                 "strategy": "DECOMPOSE",
@@ -12,23 +12,58 @@ This is a FULLY DYNAMIC, schema-agnostic implementation.
 """
 
 import re
+import sys
 import logging
-from typing import Dict, List, Set, Optional, Tuple
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Sequence references in Oracle source, which never bracket-quotes names.
+# Equivalent to SequenceAnalyzer.SEQ_USAGE_PATTERN on code without '['.
+_ORACLE_SEQ_USAGE_RE = re.compile(r'(?:(\w+)\.)?(\w+)\.(NEXTVAL|CURRVAL)', re.IGNORECASE)
 
-class SequenceMigrationStrategy(Enum):
-    """Strategy for migrating an Oracle sequence"""
+# :NEW.column := [schema.]sequence.NEXTVAL for any sequence; callers compare
+# the captured sequence name (group 3) instead of compiling a per-name pattern
+_NEW_ASSIGN_ANY_RE = re.compile(r':NEW\.(\w+)\s*:=\s*(?:(\w+)\.)?(\w+)\.NEXTVAL', re.IGNORECASE)
+_NEW_COLUMN_RE = re.compile(r':NEW\.(\w+)\s*:=', re.IGNORECASE)
+
+# Simple PK trigger heuristics, matched against uppercased trigger code
+_COMPLEXITY_RE = re.compile(r'\b(?:SELECT|UPDATE|DELETE|LOOP|WHILE)\b')
+_FOR_RE = re.compile(r'\bFOR\b')
+_IF_RE = re.compile(r'\bIF\b')
+
+# SequenceUsage set that records each analyzable object type
+_USED_IN_ATTRS = {
+    "procedure": "used_in_procedures",
+    "function": "used_in_functions",
+    "view": "used_in_views",
+    "package": "used_in_packages",
+}
+
+# dataclass(slots=True) needs Python 3.10; setup.py still accepts 3.9
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+class SequenceMigrationStrategy(str, Enum):
+    """
+    Strategy for migrating an Oracle sequence
+
+    Members are also str, so they still compare equal to their values
+    (e.g. "identity_column") for callers that check plan strategies as text.
+    """
     IDENTITY_COLUMN = "identity_column"  # Convert to IDENTITY column
     SQL_SERVER_SEQUENCE = "sql_server_sequence"  # Create SQL Server SEQUENCE
     SHARED_SEQUENCE = "shared_sequence"  # Shared across tables - must be SEQUENCE
     MANUAL_REVIEW = "manual_review"  # Complex usage - needs review
 
+    def __str__(self) -> str:
+        return self.value
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class SequenceUsage:
     """Tracks where and how a sequence is used"""
     sequence_name: str
@@ -56,6 +91,12 @@ class SequenceUsage:
     # Current value (for reseeding)
     current_value: Optional[int] = None
 
+    # Memoized determine_strategy() result; analyzers set _dirty on mutation
+    _strategy_cache: Optional[SequenceMigrationStrategy] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _dirty: bool = field(default=True, init=False, repr=False, compare=False)
+
     def get_full_name(self) -> str:
         """Get fully qualified sequence name"""
         if self.schema:
@@ -65,13 +106,13 @@ class SequenceUsage:
     def get_usage_summary(self) -> Dict:
         """Get summary of usage"""
         return {
-            "total_usages": (
-                len(self.used_in_triggers) +
-                len(self.used_in_procedures) +
-                len(self.used_in_functions) +
-                len(self.used_in_views) +
-                len(self.used_in_packages)
-            ),
+            "total_usages": sum(map(len, (
+                self.used_in_triggers,
+                self.used_in_procedures,
+                self.used_in_functions,
+                self.used_in_views,
+                self.used_in_packages
+            ))),
             "nextval_count": self.nextval_count,
             "currval_count": self.currval_count,
             "tables": len(self.associated_tables),
@@ -82,16 +123,25 @@ class SequenceUsage:
         """
         Determine the best migration strategy based on usage patterns
 
+        The result is cached until the usage is marked dirty again.
+
         Returns:
             Recommended migration strategy
         """
+        if self._dirty or self._strategy_cache is None:
+            self._strategy_cache = self._compute_strategy()
+            self._dirty = False
+        return self._strategy_cache
+
+    def _compute_strategy(self) -> SequenceMigrationStrategy:
+        """Apply the strategy rules to the current usage"""
         # Rule 1: If used ONLY in a single table's BEFORE INSERT trigger for PK
         if (self.is_simple_pk_trigger and
             len(self.associated_tables) == 1 and
-            len(self.used_in_procedures) == 0 and
-            len(self.used_in_functions) == 0 and
-            len(self.used_in_views) == 0 and
-            len(self.used_in_packages) == 0):
+            not self.used_in_procedures and
+            not self.used_in_functions and
+            not self.used_in_views and
+            not self.used_in_packages):
             return SequenceMigrationStrategy.IDENTITY_COLUMN
 
         # Rule 2: If used across multiple tables (shared sequence)
@@ -99,14 +149,14 @@ class SequenceUsage:
             return SequenceMigrationStrategy.SHARED_SEQUENCE
 
         # Rule 3: If used in procedures/functions/queries
-        if (len(self.used_in_procedures) > 0 or
-            len(self.used_in_functions) > 0 or
-            len(self.used_in_views) > 0 or
-            len(self.used_in_packages) > 0):
+        if (self.used_in_procedures or
+            self.used_in_functions or
+            self.used_in_views or
+            self.used_in_packages):
             return SequenceMigrationStrategy.SQL_SERVER_SEQUENCE
 
         # Rule 4: If used in triggers but complex pattern
-        if len(self.used_in_triggers) > 0 and not self.is_simple_pk_trigger:
+        if self.used_in_triggers and not self.is_simple_pk_trigger:
             return SequenceMigrationStrategy.SQL_SERVER_SEQUENCE
 
         # Default: Needs manual review
@@ -120,18 +170,12 @@ class SequenceAnalyzer:
     FULLY DYNAMIC - No hardcoded schemas or assumptions
     """
 
-    # Regex patterns for detecting sequence usage (schema-agnostic)
-    NEXTVAL_PATTERN = re.compile(
-        r'(?:(?:\[([^\]]+)\]|(\w+))\.)?'  # Optional schema
-        r'(?:\[([^\]]+)\]|(\w+))'  # Sequence name
-        r'\.NEXTVAL',
-        re.IGNORECASE
-    )
-
-    CURRVAL_PATTERN = re.compile(
+    # Regex pattern for detecting sequence usage (schema-agnostic).
+    # NEXTVAL and CURRVAL share one scan; the last ("op") group tells them apart.
+    SEQ_USAGE_PATTERN = re.compile(
         r'(?:(?:\[([^\]]+)\]|(\w+))\.)?'  # Optional schema
         r'(?:\[([^\]]+)\]|(\w+))'  # Sequence name
-        r'\.CURRVAL',
+        r'\.(?P<op>NEXTVAL|CURRVAL)',
         re.IGNORECASE
     )
 
@@ -143,7 +187,8 @@ class SequenceAnalyzer:
             default_schema: Default schema for unqualified references
         """
         self.default_schema = default_schema
-        self.sequences: Dict[str, SequenceUsage] = {}  # Key: fully qualified name
+        # Key: schema -> sequence name (schema-first, no per-lookup string building)
+        self.sequences: Dict[str, Dict[str, SequenceUsage]] = {}
         self.migration_plan: Dict[str, Dict] = {}
 
     def register_sequence(
@@ -160,16 +205,28 @@ class SequenceAnalyzer:
             schema: Schema name (optional)
             current_value: Current sequence value (optional)
         """
-        schema = schema or self.default_schema
-        full_name = f"{schema}.{sequence_name}"
+        schema = sys.intern(schema or self.default_schema)
+        sequence_name = sys.intern(sequence_name)
+        schema_sequences = self.sequences.setdefault(schema, {})
 
-        if full_name not in self.sequences:
-            self.sequences[full_name] = SequenceUsage(
+        if sequence_name not in schema_sequences:
+            schema_sequences[sequence_name] = SequenceUsage(
                 sequence_name=sequence_name,
                 schema=schema,
                 current_value=current_value
             )
-            logger.info(f"Registered sequence: {full_name}")
+            logger.info(f"Registered sequence: {schema}.{sequence_name}")
+
+    def _get_sequence(self, sequence_name: str, schema: str) -> SequenceUsage:
+        """Look up a tracked sequence, registering it on first reference"""
+        schema_sequences = self.sequences.get(schema)
+        if schema_sequences is not None:
+            seq_usage = schema_sequences.get(sequence_name)
+            if seq_usage is not None:
+                return seq_usage
+
+        self.register_sequence(sequence_name, schema)
+        return self.sequences[schema][sequence_name]
 
     def analyze_trigger(
         self,
@@ -189,52 +246,57 @@ class SequenceAnalyzer:
         """
         schema = schema or self.default_schema
 
-        # Find NEXTVAL usages
-        nextval_matches = list(self.NEXTVAL_PATTERN.finditer(trigger_code))
-        currval_matches = list(self.CURRVAL_PATTERN.finditer(trigger_code))
+        # Most triggers never touch a sequence - skip the regex scan for them
+        code_upper = trigger_code.upper()
+        if "NEXTVAL" not in code_upper and "CURRVAL" not in code_upper:
+            return
+
+        # Simple-PK verdict per sequence name - the trigger body doesn't change
+        # between matches, so each sequence is checked once per trigger
+        simple_pk_checks: Dict[str, bool] = {}
+        trigger_type = "BEFORE INSERT" if "BEFORE INSERT" in code_upper else "OTHER"
 
-        for match in nextval_matches:
-            seq_schema = (match.group(1) or match.group(2) or schema).strip()
-            seq_name = (match.group(3) or match.group(4)).strip()
-            full_seq_name = f"{seq_schema}.{seq_name}"
+        # Qualified names are shared by every sequence set that records them
+        full_trigger_name = sys.intern(f"{schema}.{trigger_name}")
+        full_table_name = sys.intern(f"{schema}.{table_name}")
 
+        # Find NEXTVAL/CURRVAL usages in a single pass
+        for seq_schema, seq_name, op in self._iter_sequence_refs(trigger_code, schema):
             # Register if not exists
-            if full_seq_name not in self.sequences:
-                self.register_sequence(seq_name, seq_schema)
+            seq_usage = self._get_sequence(seq_name, seq_schema)
+            seq_usage._dirty = True
+            seq_usage.used_in_triggers.add(full_trigger_name)
+
+            if op == 'CURRVAL':
+                seq_usage.currval_count += 1
+                continue
 
-            seq_usage = self.sequences[full_seq_name]
-            seq_usage.used_in_triggers.add(f"{schema}.{trigger_name}")
             seq_usage.nextval_count += 1
-            seq_usage.associated_tables.add(f"{schema}.{table_name}")
+            seq_usage.associated_tables.add(full_table_name)
 
             # Check if it's a simple PK trigger
-            if self._is_simple_pk_trigger(trigger_code, seq_name, table_name):
+            is_simple_pk = simple_pk_checks.get(seq_name)
+            if is_simple_pk is None:
+                is_simple_pk = self._is_simple_pk_trigger(
+                    trigger_code, code_upper, seq_name, table_name
+                )
+                simple_pk_checks[seq_name] = is_simple_pk
+
+            if is_simple_pk:
                 seq_usage.is_simple_pk_trigger = True
 
                 # Extract PK column name
                 pk_col = self._extract_pk_column_from_trigger(trigger_code)
                 if pk_col:
-                    seq_usage.associated_pk_columns.add((f"{schema}.{table_name}", pk_col))
+                    seq_usage.associated_pk_columns.add((full_table_name, pk_col))
 
             seq_usage.trigger_details.append({
                 "trigger": trigger_name,
                 "table": table_name,
                 "schema": schema,
-                "type": "BEFORE INSERT" if "BEFORE INSERT" in trigger_code.upper() else "OTHER"
+                "type": trigger_type
             })
 
-        for match in currval_matches:
-            seq_schema = (match.group(1) or match.group(2) or schema).strip()
-            seq_name = (match.group(3) or match.group(4)).strip()
-            full_seq_name = f"{seq_schema}.{seq_name}"
-
-            if full_seq_name not in self.sequences:
-                self.register_sequence(seq_name, seq_schema)
-
-            seq_usage = self.sequences[full_seq_name]
-            seq_usage.used_in_triggers.add(f"{schema}.{trigger_name}")
-            seq_usage.currval_count += 1
-
     def analyze_procedure(
         self,
         procedure_name: str,
@@ -295,6 +357,28 @@ class SequenceAnalyzer:
             schema
         )
 
+    def analyze_code_batch(
+        self,
+        entries: Iterable[Tuple[str, str, Optional[str], str]]
+    ):
+        """
+        Analyze many code objects for sequence usage in one call
+
+        Equivalent to calling analyze_procedure/analyze_function/analyze_view/
+        analyze_package for each entry, but usage is tallied locally and
+        written to the sequences once at the end.
+
+        Args:
+            entries: (object_type, object_name, schema, code) tuples, where
+                object_type is "procedure", "function", "view" or "package"
+                and schema may be None for the default schema
+        """
+        self._analyze_code_objects(
+            (code, object_type, f"{schema or self.default_schema}.{object_name}",
+             schema or self.default_schema)
+            for object_type, object_name, schema, code in entries
+        )
+
     def _analyze_code_object(
         self,
         code: str,
@@ -303,52 +387,65 @@ class SequenceAnalyzer:
         schema: str
     ):
         """Generic code analysis for sequence usage"""
-        nextval_matches = list(self.NEXTVAL_PATTERN.finditer(code))
-        currval_matches = list(self.CURRVAL_PATTERN.finditer(code))
-
-        for match in nextval_matches:
-            seq_schema = (match.group(1) or match.group(2) or schema).strip()
-            seq_name = (match.group(3) or match.group(4)).strip()
-            full_seq_name = f"{seq_schema}.{seq_name}"
-
-            if full_seq_name not in self.sequences:
-                self.register_sequence(seq_name, seq_schema)
-
-            seq_usage = self.sequences[full_seq_name]
-            seq_usage.nextval_count += 1
-
-            if object_type == "procedure":
-                seq_usage.used_in_procedures.add(full_object_name)
-            elif object_type == "function":
-                seq_usage.used_in_functions.add(full_object_name)
-            elif object_type == "view":
-                seq_usage.used_in_views.add(full_object_name)
-            elif object_type == "package":
-                seq_usage.used_in_packages.add(full_object_name)
-
-        for match in currval_matches:
-            seq_schema = (match.group(1) or match.group(2) or schema).strip()
-            seq_name = (match.group(3) or match.group(4)).strip()
-            full_seq_name = f"{seq_schema}.{seq_name}"
-
-            if full_seq_name not in self.sequences:
-                self.register_sequence(seq_name, seq_schema)
-
-            seq_usage = self.sequences[full_seq_name]
-            seq_usage.currval_count += 1
-
-            if object_type == "procedure":
-                seq_usage.used_in_procedures.add(full_object_name)
-            elif object_type == "function":
-                seq_usage.used_in_functions.add(full_object_name)
-            elif object_type == "view":
-                seq_usage.used_in_views.add(full_object_name)
-            elif object_type == "package":
-                seq_usage.used_in_packages.add(full_object_name)
+        self._analyze_code_objects(((code, object_type, full_object_name, schema),))
+
+    def _analyze_code_objects(self, objects: Iterable[Tuple[str, str, str, str]]):
+        """Tally sequence usage across (code, object_type, full_object_name, schema) items"""
+        # Key: (schema, sequence name) -> [nextval_count, currval_count, {object_type: names}]
+        tallies: Dict[Tuple[str, str], list] = {}
+
+        for code, object_type, full_object_name, schema in objects:
+            # Most objects never touch a sequence - skip the regex scan for them
+            code_upper = code.upper()
+            if "NEXTVAL" not in code_upper and "CURRVAL" not in code_upper:
+                continue
+
+            full_object_name = sys.intern(full_object_name)
+
+            # Count each (sequence, operation) once per object before touching tallies
+            usage_counts = Counter(self._iter_sequence_refs(code, schema))
+
+            for (seq_schema, seq_name, op), count in usage_counts.items():
+                seq_key = (seq_schema, seq_name)
+
+                tally = tallies.get(seq_key)
+                if tally is None:
+                    self._get_sequence(seq_name, seq_schema)
+                    tally = tallies[seq_key] = [0, 0, {}]
+
+                if op == 'CURRVAL':
+                    tally[1] += count
+                else:
+                    tally[0] += count
+
+                tally[2].setdefault(object_type, set()).add(full_object_name)
+
+        # Flush tallies into the tracked sequences
+        for (seq_schema, seq_name), (nextval_count, currval_count, used_in) in tallies.items():
+            seq_usage = self.sequences[seq_schema][seq_name]
+            seq_usage._dirty = True
+            seq_usage.nextval_count += nextval_count
+            seq_usage.currval_count += currval_count
+
+            for object_type, object_names in used_in.items():
+                attr = _USED_IN_ATTRS.get(object_type)
+                if attr:
+                    getattr(seq_usage, attr).update(object_names)
+
+    def _iter_sequence_refs(self, code: str, schema: str) -> Iterable[Tuple[str, str, str]]:
+        """Yield (schema, sequence name, "NEXTVAL"/"CURRVAL") for each reference in code"""
+        if '[' in code:
+            for g1, g2, g3, g4, op in self.SEQ_USAGE_PATTERN.findall(code):
+                yield (g1 or g2 or schema).strip(), (g3 or g4).strip(), op.upper()
+        else:
+            # No bracketed names possible - use the simpler Oracle pattern
+            for seq_schema, seq_name, op in _ORACLE_SEQ_USAGE_RE.findall(code):
+                yield (seq_schema or schema).strip(), seq_name, op.upper()
 
     def _is_simple_pk_trigger(
         self,
         trigger_code: str,
+        code_upper: str,
         sequence_name: str,
         table_name: str
     ) -> bool:
@@ -361,8 +458,12 @@ class SequenceAnalyzer:
         BEGIN
           :NEW.id := sequence.NEXTVAL;
         END;
+
+        code_upper is trigger_code.upper(), computed once by the caller.
         """
-        code_upper = trigger_code.upper()
+        # Cheapest test first: no assignment from NEXTVAL means no PK trigger
+        if ':=' not in trigger_code or 'NEXTVAL' not in code_upper:
+            return False
 
         # Must be BEFORE INSERT
         if "BEFORE INSERT" not in code_upper:
@@ -375,8 +476,8 @@ class SequenceAnalyzer:
         # Must have :NEW.column := [schema.]sequence.NEXTVAL pattern
         # Handle both schema.sequence.NEXTVAL and sequence.NEXTVAL
         seq_name_upper = sequence_name.upper()
-        new_pattern = r':NEW\.(\w+)\s*:=\s*(?:\w+\.)?' + re.escape(seq_name_upper) + r'\.NEXTVAL'
-        if not re.search(new_pattern, code_upper):
+        if not any(match.group(3).upper() == seq_name_upper
+                   for match in _NEW_ASSIGN_ANY_RE.finditer(trigger_code)):
             return False
 
         # Should not have complex logic (heuristic: check code length and complexity)
@@ -388,21 +489,18 @@ class SequenceAnalyzer:
 
         # Should not have SELECT, UPDATE, DELETE, LOOP, IF (beyond simple assignment)
         # Use word boundaries to avoid false matches
-        complexity_keywords = [r'\bSELECT\b', r'\bUPDATE\b', r'\bDELETE\b', r'\bLOOP\b', r'\bWHILE\b']
-
-        for keyword_pattern in complexity_keywords:
-            if re.search(keyword_pattern, code_upper):
-                return False
+        if _COMPLEXITY_RE.search(code_upper):
+            return False
 
         # Check for FOR loops (but not FOR EACH ROW which is the trigger declaration)
         # Use word boundary to avoid matching "FOR" in "BEFORE"
-        for_count = len(re.findall(r'\bFOR\b', code_upper))
+        for_count = len(_FOR_RE.findall(code_upper))
         if for_count > 1:  # More than one FOR (beyond FOR EACH ROW)
             return False
 
         # Check for IFs (more than simple validation)
         # Use word boundary to avoid matching "IF" in other words
-        if_count = len(re.findall(r'\bIF\b', code_upper))
+        if_count = len(_IF_RE.findall(code_upper))
         if if_count > 1:
             return False
 
@@ -411,11 +509,17 @@ class SequenceAnalyzer:
     def _extract_pk_column_from_trigger(self, trigger_code: str) -> Optional[str]:
         """Extract PK column name from trigger"""
         # Pattern: :NEW.column_name :=
-        match = re.search(r':NEW\.(\w+)\s*:=', trigger_code, re.IGNORECASE)
+        match = _NEW_COLUMN_RE.search(trigger_code)
         if match:
             return match.group(1)
         return None
 
+    def _iter_sequences(self) -> Iterable[Tuple[str, SequenceUsage]]:
+        """Flat view of tracked sequences as ("schema.name", usage) pairs"""
+        for schema, schema_sequences in self.sequences.items():
+            for sequence_name, seq_usage in schema_sequences.items():
+                yield f"{schema}.{sequence_name}", seq_usage
+
     def generate_migration_plan(self) -> Dict[str, Dict]:
         """
         Generate comprehensive migration plan for all sequences
@@ -425,13 +529,13 @@ class SequenceAnalyzer:
         """
         self.migration_plan = {}
 
-        for seq_full_name, seq_usage in self.sequences.items():
+        for seq_full_name, seq_usage in self._iter_sequences():
             strategy = seq_usage.determine_strategy()
 
             self.migration_plan[seq_full_name] = {
                 "sequence_name": seq_usage.sequence_name,
                 "schema": seq_usage.schema,
-                "strategy": strategy.value,
+                "strategy": strategy,
                 "usage_summary": seq_usage.get_usage_summary(),
                 "current_value": seq_usage.current_value,
                 "associated_tables": list(seq_usage.associated_tables),
@@ -498,37 +602,43 @@ class SequenceAnalyzer:
 
         return sql
 
-    def save_migration_plan(self, output_path: str):
-        """Save migration plan to JSON file"""
+    def save_migration_plan(self, output_path: str, pretty: bool = False):
+        """
+        Save migration plan to JSON file
+
+        Args:
+            output_path: Path of the JSON file to write
+            pretty: Indent the output for reading; compact by default
+        """
         import json
         from datetime import datetime
 
+        # Tally strategies in a single pass over the plan (keys are enum members)
+        strategy_counts = Counter(p["strategy"] for p in self.migration_plan.values())
+
         plan_with_metadata = {
             "generated_at": datetime.now().isoformat(),
             "total_sequences": len(self.migration_plan),
             "strategies": {
-                "identity_column": sum(
-                    1 for p in self.migration_plan.values()
-                    if p["strategy"] == SequenceMigrationStrategy.IDENTITY_COLUMN.value
-                ),
-                "sql_server_sequence": sum(
-                    1 for p in self.migration_plan.values()
-                    if p["strategy"] == SequenceMigrationStrategy.SQL_SERVER_SEQUENCE.value
-                ),
-                "shared_sequence": sum(
-                    1 for p in self.migration_plan.values()
-                    if p["strategy"] == SequenceMigrationStrategy.SHARED_SEQUENCE.value
-                ),
-                "manual_review": sum(
-                    1 for p in self.migration_plan.values()
-                    if p["strategy"] == SequenceMigrationStrategy.MANUAL_REVIEW.value
-                )
+                "identity_column": strategy_counts[SequenceMigrationStrategy.IDENTITY_COLUMN],
+                "sql_server_sequence": strategy_counts[SequenceMigrationStrategy.SQL_SERVER_SEQUENCE],
+                "shared_sequence": strategy_counts[SequenceMigrationStrategy.SHARED_SEQUENCE],
+                "manual_review": strategy_counts[SequenceMigrationStrategy.MANUAL_REVIEW]
             },
-            "sequences": self.migration_plan
+            # Strategies are stored as enum members; write their values
+            "sequences": {
+                seq_name: {**plan, "strategy": plan["strategy"].value}
+                for seq_name, plan in self.migration_plan.items()
+            }
         }
 
+        # json.dump writes encoder chunks as it goes, so the full document is
+        # never held as one string; compact separators keep large plans small
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(plan_with_metadata, f, indent=2)
+            if pretty:
+                json.dump(plan_with_metadata, f, indent=2)
+            else:
+                json.dump(plan_with_metadata, f, separators=(',', ':'))
 
         logger.info(f"Migration plan saved to: {output_path}")
 
@@ -537,11 +647,8 @@ class SequenceAnalyzer:
         if not self.migration_plan:
             self.generate_migration_plan()
 
-        lines = []
-        lines.append("=" * 80)
-        lines.append("ORACLE SEQUENCE MIGRATION PLAN")
-        lines.append("=" * 80)
-        lines.append("")
+        rule = "=" * 80
+        lines = [rule, "ORACLE SEQUENCE MIGRATION PLAN", rule, ""]
 
         # Summary by strategy
         strategies = {}
@@ -551,43 +658,49 @@ class SequenceAnalyzer:
                 strategies[strategy] = []
             strategies[strategy].append(seq_name)
 
+        # Sort once; both sections walk strategies in the same order
+        sorted_strategies = sorted(strategies, key=lambda strategy: strategy.value)
+
         lines.append("SUMMARY BY STRATEGY:")
-        for strategy, sequences in sorted(strategies.items()):
-            lines.append(f"  {strategy.upper()}: {len(sequences)} sequence(s)")
+        lines.extend(
+            f"  {strategy.value.upper()}: {len(strategies[strategy])} sequence(s)"
+            for strategy in sorted_strategies
+        )
         lines.append("")
 
         # Details for each strategy
-        for strategy in sorted(strategies.keys()):
-            lines.append("=" * 80)
-            lines.append(f"STRATEGY: {strategy.upper()}")
-            lines.append("=" * 80)
+        for strategy in sorted_strategies:
+            lines.extend((rule, f"STRATEGY: {strategy.value.upper()}", rule))
 
             for seq_name in sorted(strategies[strategy]):
                 plan = self.migration_plan[seq_name]
-                lines.append(f"\nSequence: {seq_name}")
-                lines.append(f"  Current Value: {plan['current_value']}")
-                lines.append(f"  Usage:")
                 usage = plan["usage_summary"]
-                lines.append(f"    Total Usages: {usage['total_usages']}")
-                lines.append(f"    NEXTVAL: {usage['nextval_count']}, CURRVAL: {usage['currval_count']}")
-                lines.append(f"    Associated Tables: {usage['tables']}")
+                lines.extend((
+                    f"\nSequence: {seq_name}",
+                    f"  Current Value: {plan['current_value']}",
+                    "  Usage:",
+                    f"    Total Usages: {usage['total_usages']}",
+                    f"    NEXTVAL: {usage['nextval_count']}, CURRVAL: {usage['currval_count']}",
+                    f"    Associated Tables: {usage['tables']}"
+                ))
 
                 if plan["associated_tables"]:
                     lines.append(f"  Tables: {', '.join(plan['associated_tables'])}")
 
                 if plan["associated_pk_columns"]:
-                    lines.append(f"  PK Columns:")
-                    for pk_info in plan["associated_pk_columns"]:
-                        lines.append(f"    {pk_info['table']}.{pk_info['column']}")
+                    lines.append("  PK Columns:")
+                    lines.extend(
+                        f"    {pk_info['table']}.{pk_info['column']}"
+                        for pk_info in plan["associated_pk_columns"]
+                    )
 
                 # Show migration SQL
                 if plan["migration_sql"]:
-                    lines.append(f"  Migration SQL:")
-                    for sql_key, sql_stmt in plan["migration_sql"].items():
-                        lines.append(f"    {sql_stmt}")
+                    lines.append("  Migration SQL:")
+                    lines.extend("    " + sql_stmt for sql_stmt in plan["migration_sql"].values())
 
                 lines.append("")
 
-        lines.append("=" * 80)
+        lines.append(rule)
 
         return "\n".join(lines)
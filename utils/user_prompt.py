@@ -3,13 +3,92 @@ User Prompt Utilities
 Handles user interaction with timeout and defaults
 """
 import sys
+import time
 import select
+import threading
 import logging
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
+def _read_line_pipe(timeout: float) -> Optional[str]:
+    """
+    Read a line from non-console stdin, giving up after timeout seconds
+
+    An idle pipe (subprocess, CI, launcher script) can block readline()
+    indefinitely, so the read runs in a daemon thread that is abandoned on
+    timeout.
+
+    Args:
+        timeout: Timeout in seconds
+
+    Returns:
+        The line read (without the newline), or None on timeout
+    """
+    line = [None]
+
+    def read():
+        try:
+            line[0] = sys.stdin.readline()
+        except (OSError, ValueError):
+            line[0] = ''
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    reader.join(timeout)
+
+    if reader.is_alive():
+        return None
+    return line[0].rstrip('\r\n')
+
+
+def _read_line_windows(timeout: float) -> Optional[str]:
+    """
+    Read a line from the Windows console, giving up after timeout seconds
+
+    Polls msvcrt.kbhit() rather than blocking on input() in a helper thread,
+    so no thread is left waiting on stdin after a timeout.
+
+    Args:
+        timeout: Timeout in seconds
+
+    Returns:
+        The line typed (without the newline), or None on timeout
+    """
+    # kbhit() only sees the console - piped input needs its own reader
+    if not sys.stdin.isatty():
+        return _read_line_pipe(timeout)
+
+    import msvcrt
+
+    deadline = time.monotonic() + timeout
+    chars = []
+
+    while time.monotonic() < deadline:
+        if not msvcrt.kbhit():
+            time.sleep(0.05)
+            continue
+
+        char = msvcrt.getwche()
+        if char in ('\r', '\n'):
+            print()
+            return ''.join(chars)
+        if char == '\x03':
+            raise KeyboardInterrupt
+        if char == '\b':
+            # getwche already moved the cursor back; blank out the character
+            if chars:
+                chars.pop()
+                msvcrt.putwch(' ')
+                msvcrt.putwch('\b')
+            continue
+
+        chars.append(char)
+
+    return None
+
+
 def prompt_with_timeout(
     question: str,
     options: list,
@@ -37,33 +116,17 @@ def prompt_with_timeout(
     print(f"   Your choice: ", end='', flush=True)
 
     try:
-        # Windows doesn't support select on stdin, use simpler approach
+        # Windows doesn't support select on stdin, poll the console instead
         if sys.platform == 'win32':
-            # Use input with a simple message
-            import threading
-
-            user_input = [None]
-            timeout_occurred = [False]
-
-            def get_input():
-                try:
-                    user_input[0] = input().strip().lower()
-                except:
-                    pass
+            line = _read_line_windows(timeout)
 
-            input_thread = threading.Thread(target=get_input)
-            input_thread.daemon = True
-            input_thread.start()
-            input_thread.join(timeout)
-
-            if input_thread.is_alive():
+            if line is None:
                 # Timeout occurred
-                timeout_occurred[0] = True
                 print(f"\n   ⏱️  Timeout - using default: '{default}'")
                 logger.info(f"User prompt timeout - using default: {default}")
                 return default
 
-            choice = user_input[0]
+            choice = line.strip().lower()
             if not choice:
                 print(f"   ℹ️  No input - using default: '{default}'")
                 logger.info(f"No user input - using default: {default}")
@@ -166,26 +229,13 @@ def confirm_action(
 
     try:
         if sys.platform == 'win32':
-            import threading
-
-            user_input = [None]
-
-            def get_input():
-                try:
-                    user_input[0] = input().strip().lower()
-                except:
-                    pass
-
-            input_thread = threading.Thread(target=get_input)
-            input_thread.daemon = True
-            input_thread.start()
-            input_thread.join(timeout)
+            line = _read_line_windows(timeout)
 
-            if input_thread.is_alive():
+            if line is None:
                 print(f"\n   ⏱️  Timeout - using default: {'Yes' if default else 'No'}")
                 return default
 
-            choice = user_input[0]
+            choice = line.strip().lower()
             if not choice:
                 return default
 
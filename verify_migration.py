@@ -4,149 +4,431 @@ Checks if data actually migrated to SQL Server despite -1 rowcount
 """
 
 import pyodbc
+import io
 import json
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+
+# Reuse driver-level connections across calls (must be set before connecting)
+pyodbc.pooling = True
+
+_CONN_TEMPLATE = (
+    "DRIVER={{{driver}}};"
+    "SERVER={server};"
+    "DATABASE={database};"
+    "UID={user};"
+    "PWD={password};"
+    "TrustServerCertificate=yes;"
+    "MARS_Connection=yes;"
+    "Encrypt=yes;"
+)
+
+# Table names are interpolated into the COUNT(*) probe, so only plain
+# identifiers are allowed
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Verdicts by minimum number of tables with data, checked in order
+_VERDICTS = (
+    (4, (
+        "✅ MIGRATION SUCCESSFUL!",
+        "   {with_data}/{checked} tables have data",
+        "\n   Despite -1 rowcount display, data was migrated correctly!",
+        "   The -1 rowcount is a pyodbc driver quirk, not a failure.",
+    )),
+    (1, (
+        "⚠️  PARTIAL MIGRATION",
+        "   {with_data}/{checked} tables have data",
+        "\n   Some tables migrated successfully, others may have failed",
+    )),
+    (0, (
+        "❌ MIGRATION FAILED",
+        "   No data found in any tables",
+        "\n   Check migration logs for errors",
+    )),
+)
+
+_CONFIG_PATH = 'config/sqlserver_config.json'
+
+# Row counts from earlier runs with the last write time they were read at,
+# kept next to the credentials they were read with
+_CACHE_PATH = os.path.join(os.path.dirname(_CONFIG_PATH), '.verify_cache.json')
+
+
+@lru_cache(maxsize=1)
+def _load_creds():
+    """Read SQL Server credentials once, with driver and user defaults applied"""
+    with open(_CONFIG_PATH, 'r') as f:
+        creds = json.load(f)
+
+    params = dict(creds)
+    params['driver'] = creds.get('driver', 'ODBC Driver 18 for SQL Server')
+    params['user'] = creds['user'] if 'user' in creds else creds['username']
+    return params
+
+
+@lru_cache(maxsize=1)
+def _load_conn_str():
+    """Build the ODBC connection string from the configured credentials"""
+    return _CONN_TEMPLATE.format_map(_load_creds())
+
+
+def _cache_scope():
+    """Cache section for the configured server and database"""
+    creds = _load_creds()
+    return f"{creds['server']}/{creds['database']}"
+
+
+def _load_cache():
+    """Cached row counts keyed by scope then table, or {} if missing or unreadable"""
+    try:
+        with open(_CACHE_PATH, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(cache):
+    """Write the cache through a temp file so a crash never leaves it half-written"""
+    tmp_path = _CACHE_PATH + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, _CACHE_PATH)
+    except OSError:
+        # The cache only saves work; verification results are unaffected
+        pass
+
+
+def _count_rows(conn_str, table):
+    """Count rows in one table on its own connection; returns (table, count or error)"""
+    try:
+        conn = pyodbc.connect(conn_str, autocommit=True, timeout=5)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            return table, cursor.fetchone()[0]
+        finally:
+            conn.close()
+    except pyodbc.Error as e:
+        return table, e
+
 
 def verify_migration():
     """Verify migration results by querying SQL Server"""
 
-    print("\n" + "=" * 70)
-    print("📊 MIGRATION VERIFICATION")
-    print("=" * 70)
+    # Collect the report in memory and write it to the console once
+    buf = io.StringIO()
+    try:
+        _run_verification(buf.write)
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+def _run_verification(write):
+    """Query SQL Server and pass the verification report to write()"""
+
+    write("\n" + "=" * 70 + "\n")
+    write("📊 MIGRATION VERIFICATION\n")
+    write("=" * 70 + "\n")
 
     # Load SQL Server credentials
     try:
-        with open('config/sqlserver_config.json', 'r') as f:
-            creds = json.load(f)
+        conn_str = _load_conn_str()
     except Exception as e:
-        print(f"\n❌ Failed to load credentials: {e}")
+        write(f"\n❌ Failed to load credentials: {e}\n")
         return
 
     # Connect to SQL Server
     try:
-        driver = creds.get('driver', 'ODBC Driver 18 for SQL Server')
-        username = creds.get('user') or creds.get('username')
+        conn = pyodbc.connect(conn_str, autocommit=True, timeout=5)
+    except Exception as e:
+        write(f"\n❌ Connection failed: {e}\n")
+        return
 
-        conn_str = (
-            f"DRIVER={{{driver}}};"
-            f"SERVER={creds['server']};"
-            f"DATABASE={creds['database']};"
-            f"UID={username};"
-            f"PWD={creds['password']};"
-            f"TrustServerCertificate=yes;"
-        )
+    # pyodbc's own context managers commit but leave the handles open;
+    # closing() releases the cursor and connection on every exit path
+    with closing(conn), closing(conn.cursor()) as cursor:
+        # Skip the rowcount message SQL Server sends after every statement
+        cursor.execute("SET NOCOUNT ON")
 
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
+        write("\n✅ Connected to SQL Server\n\n")
 
-        print("\n✅ Connected to SQL Server\n")
+        _format_report(_fetch_stats(cursor), write)
 
-    except Exception as e:
-        print(f"\n❌ Connection failed: {e}")
-        return
 
+def _run_batch(cursor, statements):
+    """
+    Run labelled statements as one batch and read their result sets in order
+
+    A failing statement is recorded against its own label. Statements after
+    it that could not be read from the batch are sent again as a new batch,
+    so one failure never hides the results of the others.
+
+    Args:
+        cursor: Open cursor
+        statements: List of (label, sql, params) tuples
+
+    Returns:
+        (results, errors): label -> (columns, rows), label -> pyodbc.Error
+    """
+    results = {}
+    errors = {}
+    pending = list(statements)
+    cursor.arraysize = 5
+
+    while pending:
+        batch_sql = "\n".join(sql for _, sql, _ in pending)
+        params = [param for _, _, stmt_params in pending for param in stmt_params]
+        try:
+            cursor.execute(batch_sql, *params)
+            while pending:
+                label = pending[0][0]
+                # Snapshot column names per result set before moving on
+                columns = [col[0] for col in cursor.description]
+                if label == 'sample':
+                    # Sample rows are capped by TOP 5; fetch them in one bounded call
+                    rows = cursor.fetchmany(5)
+                else:
+                    rows = cursor.fetchall()
+                results[label] = (columns, rows)
+                pending.pop(0)
+                if not cursor.nextset():
+                    break
+        except pyodbc.Error as e:
+            # The error belongs to the statement whose result was being read
+            errors[pending.pop(0)[0]] = e
+
+    return results, errors
+
+
+def _fetch_stats(cursor) -> dict:
+    """
+    Collect row counts, identity columns and the LOANS sample
+
+    Returns:
+        Dict with 'tables' (checked in order), 'counts' (table -> row count,
+        or the error that prevented counting), 'identity' (table ->
+        identity column names), 'identity_error', 'sample' ((columns, rows)
+        or None) and 'sample_error' (the pyodbc.Error for a failed
+        statement, else None)
+    """
     # Tables to verify
     tables = ['LOANS', 'LOAN_AUDIT', 'LOAN_PAYMENTS', 'LOAN_SCHEDULE', 'STG_LOAN_APPS']
 
-    print("\n" + "-" * 70)
-    print("TABLE DATA VERIFICATION")
-    print("-" * 70 + "\n")
+    # Names that are not plain identifiers are reported, never queried
+    invalid = {
+        table: ValueError(f"Invalid table name: {table!r}")
+        for table in tables if not _IDENTIFIER_RE.fullmatch(table)
+    }
+    valid = [table for table in tables if table not in invalid]
+
+    # Last write per table. Tables whose timestamp still matches the cache
+    # keep their cached row count and are not counted again; tables with no
+    # recorded write since the last server restart are always counted.
+    placeholders = ", ".join("?" * len(valid))
+    try:
+        cursor.execute(f"""
+        SELECT OBJECT_NAME(object_id), MAX(last_user_update)
+        FROM sys.dm_db_index_usage_stats
+        WHERE database_id = DB_ID() AND OBJECT_NAME(object_id) IN ({placeholders})
+        GROUP BY object_id
+        """, *valid)
+        last_updates = {
+            name.upper(): str(last_update)
+            for name, last_update in cursor.fetchall()
+            if last_update is not None
+        }
+    except pyodbc.Error:
+        last_updates = {}
 
-    total_tables = 0
-    tables_with_data = 0
+    # Entries are kept per server and database, so switching the config to
+    # another database never reuses counts from the old one
+    cache = _load_cache()
+    entries = cache.setdefault(_cache_scope(), {})
+    row_counts = {}
+    for table in valid:
+        key = table.upper()
+        entry = entries.get(key)
+        if entry and key in last_updates and entry.get('last_update') == last_updates[key]:
+            row_counts[key] = entry['row_count']
 
+    stale = [table for table in valid if table.upper() not in row_counts]
+
+    # Row counts and the LOANS sample go to the server as one batch; result
+    # sets are read back in order with nextset()
+    statements = []
+    if stale:
+        statements.append(('counts', f"""
+        SELECT OBJECT_NAME(object_id), SUM(row_count)
+        FROM sys.dm_db_partition_stats
+        WHERE index_id IN (0, 1) AND OBJECT_NAME(object_id) IN ({", ".join("?" * len(stale))})
+        GROUP BY object_id;
+        """, stale))
+    statements.append(('sample', "SELECT TOP 5 * FROM LOANS;", []))
+
+    result_sets, errors = _run_batch(cursor, statements)
+
+    # The partition stats DMV needs VIEW DATABASE STATE; sys.partitions only
+    # needs metadata visibility, so logins without the permission use it
+    if 'counts' in errors:
+        fallback, _ = _run_batch(cursor, [('counts', f"""
+        SELECT t.name, SUM(p.rows)
+        FROM sys.tables t
+        JOIN sys.partitions p ON p.object_id = t.object_id
+        WHERE p.index_id < 2 AND t.name IN ({", ".join("?" * len(stale))})
+        GROUP BY t.name;
+        """, stale)])
+        result_sets.update(fallback)
+
+    # Counts read from partition stats (heap or clustered index only)
+    if 'counts' in result_sets:
+        for name, count in result_sets['counts'][1]:
+            row_counts[name.upper()] = count
+
+    # Tables missing from the metadata are counted directly. pyodbc releases
+    # the GIL during ODBC calls, so the probes run concurrently, one
+    # connection per worker.
+    missing = [table for table in valid if table.upper() not in row_counts]
+    probe_results = {}
+    if missing:
+        conn_str = _load_conn_str()
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            probe_results = dict(executor.map(lambda t: _count_rows(conn_str, t), missing))
+
+    counts = {}
     for table in tables:
-        try:
-            # Check if table exists and get row count
-            query = f"SELECT COUNT(*) FROM {table}"
-            cursor.execute(query)
-            count = cursor.fetchone()[0]
+        count = invalid.get(table, row_counts.get(table.upper()))
+        counts[table] = probe_results[table] if count is None else count
 
-            if count > 0:
-                print(f"✅ {table:<20} - {count} rows")
-                tables_with_data += 1
-            else:
-                print(f"⚠️  {table:<20} - 0 rows (empty)")
+    # Remember fresh counts for tables with a known last write
+    cache_changed = False
+    for table in stale:
+        key = table.upper()
+        if key in last_updates and not isinstance(counts[table], Exception):
+            entries[key] = {'last_update': last_updates[key], 'row_count': counts[table]}
+            cache_changed = True
+    if cache_changed:
+        _save_cache(cache)
 
-            total_tables += 1
+    # Identity columns are only checked on tables that received rows, so an
+    # empty migration skips the query entirely
+    nonempty = [
+        table for table in valid
+        if not isinstance(counts[table], Exception) and counts[table] > 0
+    ]
+    identity_cols = defaultdict(list)
+    if nonempty:
+        identity_sets, identity_errors = _run_batch(cursor, [('identity', f"""
+        SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_NAME IN ({", ".join("?" * len(nonempty))})
+        AND COLUMNPROPERTY(OBJECT_ID(TABLE_SCHEMA + '.' + TABLE_NAME),
+                         COLUMN_NAME, 'IsIdentity') = 1;
+        """, nonempty)])
+        errors.update(identity_errors)
+        if 'identity' in identity_sets:
+            for table_name, column_name, _ in identity_sets['identity'][1]:
+                identity_cols[table_name.upper()].append(column_name)
 
-        except pyodbc.Error as e:
-            print(f"❌ {table:<20} - Table not found or error: {e}")
+    return {
+        'tables': tables,
+        'counts': counts,
+        'identity': {table: identity_cols.get(table.upper(), []) for table in tables},
+        'identity_error': errors.get('identity'),
+        'sample': result_sets.get('sample'),
+        'sample_error': errors.get('sample'),
+    }
 
-    print("\n" + "-" * 70)
-    print("SUMMARY")
-    print("-" * 70)
-    print(f"\nTables checked: {total_tables}")
-    print(f"Tables with data: {tables_with_data}")
-    print(f"Empty tables: {total_tables - tables_with_data}")
 
-    # Show detailed data from LOANS table
-    print("\n" + "-" * 70)
-    print("SAMPLE DATA FROM LOANS TABLE")
-    print("-" * 70 + "\n")
+def _format_report(stats: dict, write) -> None:
+    """Render the verification report for stats from _fetch_stats() to write()"""
+    lines = []
 
-    try:
-        cursor.execute("SELECT TOP 5 * FROM LOANS")
-        rows = cursor.fetchall()
+    lines.append("\n" + "-" * 70)
+    lines.append("TABLE DATA VERIFICATION")
+    lines.append("-" * 70 + "\n")
 
-        if rows:
-            # Get column names
-            columns = [col[0] for col in cursor.description]
-            print(f"Columns: {', '.join(columns)}")
-            print()
+    for table in stats['tables']:
+        count = stats['counts'][table]
 
-            for row in rows:
-                print(f"Row: {dict(zip(columns, row))}")
+        if isinstance(count, Exception):
+            lines.append(f"❌ {table:<20} - Table not found or error: {count}")
+        elif count > 0:
+            lines.append(f"✅ {table:<20} - {count} rows")
         else:
-            print("No data found in LOANS table")
+            lines.append(f"⚠️  {table:<20} - 0 rows (empty)")
 
-    except Exception as e:
-        print(f"Error reading LOANS table: {e}")
+    # Tables that could be counted, and how many of them hold rows
+    results = {
+        table: count for table, count in stats['counts'].items()
+        if not isinstance(count, Exception)
+    }
+    total_tables = len(results)
+    tables_with_data = sum(1 for count in results.values() if count > 0)
 
-    # Check for IDENTITY columns
-    print("\n" + "-" * 70)
-    print("IDENTITY COLUMNS CHECK")
-    print("-" * 70 + "\n")
+    lines.append("\n" + "-" * 70)
+    lines.append("SUMMARY")
+    lines.append("-" * 70)
+    lines.append(f"\nTables checked: {total_tables}")
+    lines.append(f"Tables with data: {tables_with_data}")
+    lines.append(f"Empty tables: {total_tables - tables_with_data}")
 
-    for table in tables:
-        try:
-            query = """
-            SELECT COLUMN_NAME, DATA_TYPE
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_NAME = ?
-            AND COLUMNPROPERTY(OBJECT_ID(TABLE_SCHEMA + '.' + TABLE_NAME),
-                             COLUMN_NAME, 'IsIdentity') = 1
-            """
-            cursor.execute(query, table)
-            identity_cols = cursor.fetchall()
-
-            if identity_cols:
-                cols = ', '.join([col[0] for col in identity_cols])
-                print(f"🔑 {table:<20} - IDENTITY: {cols}")
-
-        except:
-            pass
-
-    cursor.close()
-    conn.close()
-
-    print("\n" + "=" * 70)
-    print("VERIFICATION COMPLETE")
-    print("=" * 70 + "\n")
-
-    # Verdict
-    if tables_with_data >= 4:
-        print("✅ MIGRATION SUCCESSFUL!")
-        print(f"   {tables_with_data}/{total_tables} tables have data")
-        print("\n   Despite -1 rowcount display, data was migrated correctly!")
-        print("   The -1 rowcount is a pyodbc driver quirk, not a failure.")
-    elif tables_with_data > 0:
-        print("⚠️  PARTIAL MIGRATION")
-        print(f"   {tables_with_data}/{total_tables} tables have data")
-        print("\n   Some tables migrated successfully, others may have failed")
+    # Show detailed data from LOANS table
+    lines.append("\n" + "-" * 70)
+    lines.append("SAMPLE DATA FROM LOANS TABLE")
+    lines.append("-" * 70 + "\n")
+
+    if stats['sample'] is not None:
+        columns, rows = stats['sample']
+
+        if rows:
+            lines.append(f"Columns: {', '.join(columns)}")
+            lines.append("")
+            lines.extend(
+                "Row: " + ", ".join(f"{k}={v!r}" for k, v in zip(columns, row))
+                for row in rows
+            )
+        else:
+            lines.append("No data found in LOANS table")
     else:
-        print("❌ MIGRATION FAILED")
-        print("   No data found in any tables")
-        print("\n   Check migration logs for errors")
+        lines.append(f"Error reading LOANS table: {stats['sample_error']}")
+
+    # Identity columns were only fetched once some table has data
+    if tables_with_data > 0:
+        lines.append("\n" + "-" * 70)
+        lines.append("IDENTITY COLUMNS CHECK")
+        lines.append("-" * 70 + "\n")
+
+        if stats['identity_error'] is not None:
+            lines.append(f"Error reading identity columns: {stats['identity_error']}")
+
+        for table in stats['tables']:
+            cols = stats['identity'][table]
+            if cols:
+                lines.append(f"🔑 {table:<20} - IDENTITY: {', '.join(cols)}")
+
+    lines.append("\n" + "=" * 70)
+    lines.append("VERIFICATION COMPLETE")
+    lines.append("=" * 70 + "\n")
+
+    # Verdict: first entry whose minimum the tables with data reach
+    verdict_lines = next(
+        candidate for min_with_data, candidate in _VERDICTS
+        if tables_with_data >= min_with_data
+    )
+    lines.extend(
+        line.format(with_data=tables_with_data, checked=total_tables)
+        for line in verdict_lines
+    )
+
+    write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":